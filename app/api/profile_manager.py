@@ -11,6 +11,7 @@ from eth_account import Account as EthAccount
 from ..services.storage import JSONStorage
 from ..services.rise_client import RiseClient
 from ..models import Account, Persona, TradingStyle, Trade
+from ..utils.keys import address_from_key
 from ..config import settings
 
 
@@ -183,7 +184,7 @@ async def list_admin_profiles(
             {
                 "id": acc.id,
                 "address": acc.address,
-                "signer_address": EthAccount.from_key(acc.signer_key).address,
+                "signer_address": address_from_key(acc.signer_key),
                 "persona": acc.persona.model_dump() if acc.persona else None,
                 "is_active": acc.is_active,
                 "created_at": acc.created_at
@@ -1,5 +1,6 @@
 """Account and persona management for RISE AI trading bot."""
 
+import asyncio
 import uuid
 from typing import List, Optional
 
@@ -146,9 +147,11 @@ class AccountManager:
         }
         
         try:
-            # Check RISE balance and positions
-            balance = await self.rise_client.get_balance(account.address)
-            positions = await self.rise_client.get_all_positions(account.address)
+            # Check RISE balance and positions concurrently
+            balance, positions = await asyncio.gather(
+                self.rise_client.get_balance(account.address),
+                self.rise_client.get_all_positions(account.address),
+            )
             
             status.update({
                 "balance": balance,
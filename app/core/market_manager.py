@@ -56,7 +56,7 @@ class GlobalMarketManager:
     async def update_markets_file(self):
         """Update the markets.json file with fresh data from API."""
         try:
-            markets = await self.rise_client.get_markets()
+            markets = await self.rise_client.get_markets(fresh=True)
             
             markets_data = {
                 "last_updated": datetime.utcnow().isoformat(),
@@ -129,7 +129,7 @@ class GlobalMarketManager:
             # Get enhanced market data with prices and changes
             enhanced_data = await self.rise_client.get_enhanced_market_data()
             
-            # Get full markets list
+            # Full markets list, served from the cache the call above just refreshed
             markets = await self.rise_client.get_markets()
             
             # Update our stored market data with latest prices
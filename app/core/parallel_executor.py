@@ -139,7 +139,7 @@ class ParallelProfileExecutor:
         # 1. Get current positions
         try:
             positions = await self.rise_client.get_all_positions(profile.address)
-            position_count = len([p for p in positions if float(p.get("size", 0)) != 0])
+            position_count = sum(1 for p in positions if float(p.get("size", 0)) != 0)
             
             # Save position snapshots for tracking
             for pos_data in positions:
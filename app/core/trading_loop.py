@@ -143,7 +143,7 @@ class TradingBot:
             pnl_data = await self.rise_client.calculate_pnl(account.address)
             
             total_pnl = pnl_data.get("total_pnl", 0.0)
-            position_count = len([p for p in positions if float(p.get("size", 0)) != 0])
+            position_count = sum(1 for p in positions if float(p.get("size", 0)) != 0)
             
             self.logger.info(f"   📊 Positions: {position_count}, P&L: ${total_pnl:+.2f}")
             
@@ -343,7 +343,7 @@ class TradingBot:
             self.market_cache.update(enhanced_data)
             self.market_cache["last_update"] = datetime.now()
             
-            # Also get the full markets list for reference
+            # Also get the full markets list, just refreshed by the call above
             markets = await self.rise_client.get_markets()
             self.market_cache["markets"] = markets
             
@@ -2,9 +2,9 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class TradingStyle(str, Enum):
@@ -85,6 +85,75 @@ class Position(BaseModel):
     unrealized_pnl: float
     realized_pnl: float = 0.0
     timestamp: datetime = datetime.now()
+    
+    @classmethod
+    def validate_many(cls, rows: List[Dict[str, Any]]) -> List["Position"]:
+        """Validate a list of position dicts in a single call."""
+        return _POSITION_LIST.validate_python(rows)
+
+
+_POSITION_LIST = TypeAdapter(List[Position])
+
+
+class PositionRow(BaseModel):
+    """Raw position entry from the positions API, typed once per batch."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
+    market: Optional[str] = None  # "BTC-USD"
+    market_id: Optional[int] = None
+    side: str = "long"
+    size: float = 0.0
+    avg_price: float = Field(0.0, alias="avgPrice")
+    mark_price: Optional[float] = Field(None, alias="markPrice")
+    notional_value: float = Field(0.0, alias="notionalValue")
+    unrealized_pnl: float = Field(0.0, alias="unrealizedPnl")
+    realized_pnl: float = Field(0.0, alias="realizedPnl")
+    
+    @classmethod
+    def validate_many(cls, rows: List[Dict[str, Any]]) -> List["PositionRow"]:
+        """Validate a list of raw position dicts in a single call."""
+        return _POSITION_ROW_LIST.validate_python(rows)
+
+
+_POSITION_ROW_LIST = TypeAdapter(List[PositionRow])
+
+
+class Market(BaseModel):
+    """Market metadata with numeric fields converted once."""
+    model_config = ConfigDict(frozen=True)
+    
+    market_id: int
+    symbol: str  # "BTC-USD"
+    base_asset_symbol: str = ""
+    last_price: float = 0.0
+    available: bool = False
+    min_size: Optional[float] = None
+    max_leverage: Optional[float] = None
+    
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "Market":
+        """Build from a raw /v1/markets entry, where numbers arrive as strings."""
+        base_asset = data.get("base_asset_symbol", "")
+        base = base_asset.split("/")[0] if "/" in base_asset else base_asset
+        min_size = data.get("min_size")
+        max_leverage = data.get("max_leverage")
+        return cls(
+            market_id=int(data.get("market_id", 0)),
+            symbol=data.get("symbol") or (f"{base}-USD" if base else ""),
+            base_asset_symbol=base_asset,
+            last_price=float(data.get("last_price") or 0),
+            available=bool(data.get("available", False)),
+            min_size=float(min_size) if min_size is not None else None,
+            max_leverage=float(max_leverage) if max_leverage is not None else None,
+        )
+
+
+class PnLResponse(BaseModel):
+    """P&L summary returned by RiseClient.calculate_pnl."""
+    model_config = ConfigDict(extra="ignore")
+    
+    total_pnl: float = 0.0
+    positions: Dict[str, float] = {}  # symbol -> unrealized P&L
 
 
 class TradeDecision(BaseModel):
@@ -188,7 +188,8 @@ class AccountCreator:
     ) -> Tuple[str, Account]:
         """Create Account object from successful creation."""
         trader_profile = create_trader_profile(personality_type)
-        timestamp = int(datetime.now().timestamp())
+        now = datetime.now()
+        timestamp = int(now.timestamp())
         account_id = f"profile_{timestamp}"
         
         account = Account(
@@ -208,11 +209,11 @@ class AccountCreator:
             ),
             is_active=True,
             is_registered=registration_success,
-            registered_at=datetime.now() if registration_success else None,
+            registered_at=now if registration_success else None,
             has_deposited=deposit_success,
-            deposited_at=datetime.now() if deposit_success else None,
+            deposited_at=now if deposit_success else None,
             deposit_amount=deposit_amount if deposit_success else None,
-            created_at=datetime.now()
+            created_at=now
         )
         
         return account_id, account
@@ -304,8 +304,8 @@ class TradingTools:
         current_price = float(market_data.get("index_price", market_data.get("last_price", 0)))
         
         # Get available balance from free margin
-        from eth_account import Account as EthAccount
-        account_address = EthAccount.from_key(account_key).address
+        from ..utils.keys import address_from_key
+        account_address = address_from_key(account_key)
         
         # Use equity monitor for accurate free margin
         from ..services.equity_monitor import get_equity_monitor
@@ -390,8 +390,8 @@ class TradingTools:
         market_id = int(market_data.get("market_id", 0))
         
         # Get available balance
-        from eth_account import Account as EthAccount
-        account_address = EthAccount.from_key(account_key).address
+        from ..utils.keys import address_from_key
+        account_address = address_from_key(account_key)
         balance_data = await self.rise_client.get_balance(account_address)
         available = float(balance_data.get("cross_margin_balance", 0))
         
@@ -431,8 +431,8 @@ class TradingTools:
         market_id = int(market_data.get("market_id", 0))
         current_price = float(market_data.get("index_price", market_data.get("last_price", 0)))
         
-        from eth_account import Account as EthAccount
-        account_address = EthAccount.from_key(account_key).address
+        from ..utils.keys import address_from_key
+        account_address = address_from_key(account_key)
         position = await self.rise_client.get_position(account_address, market_id)
         
         position_size = float(position.get("size", 0))
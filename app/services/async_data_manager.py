@@ -113,15 +113,11 @@ class AsyncDataManager:
             (now - self._last_market_update).total_seconds() < self.market_cache_ttl):
             return self._market_cache
         
-        # Fetch fresh data in parallel
-        enhanced_data_task = self.rise_client.get_enhanced_market_data()
-        markets_task = self.rise_client.get_markets()
-        
         try:
-            enhanced_data, markets = await asyncio.gather(
-                enhanced_data_task, 
-                markets_task
-            )
+            # Fetch fresh data; the markets list then comes from the cache
+            # get_enhanced_market_data just refreshed, so only one request goes out
+            enhanced_data = await self.rise_client.get_enhanced_market_data()
+            markets = await self.rise_client.get_markets()
             
             # Build market lookup
             market_lookup = {}
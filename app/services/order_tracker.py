@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from typing import Dict, Optional, List, Set
 from datetime import datetime, timedelta
 
@@ -12,8 +13,10 @@ from .storage import JSONStorage
 class OrderTracker:
     """Track order success by monitoring trades and positions."""
     
-    def __init__(self):
-        self.rise_client = RiseClient()
+    def __init__(self, rise_client: Optional[RiseClient] = None):
+        # A client passed in is borrowed and left open by close()
+        self._owns_client = rise_client is None
+        self.rise_client = rise_client or RiseClient()
         self.storage = JSONStorage()
         self.known_trades: Dict[str, Set[str]] = {}  # account -> set of trade IDs
         
@@ -21,9 +24,12 @@ class OrderTracker:
         self,
         account: str,
         order_id: str,
-        expected_side: str,
-        expected_size: float,
-        timeout_seconds: int = 10
+        expected_side: Optional[str] = None,
+        expected_size: Optional[float] = None,
+        timeout_seconds: float = 10,
+        initial_delay: float = 1.0,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 1.0
     ) -> Dict:
         """Check if an order was successfully executed.
         
@@ -33,18 +39,21 @@ class OrderTracker:
             expected_side: Expected side (buy/sell)
             expected_size: Expected size in BTC
             timeout_seconds: How long to wait for order to appear
+            initial_delay: Wait before the first check, giving the API time to update
+            poll_interval: First delay between checks, doubled after each miss
+            max_poll_interval: Cap on the delay between checks
             
         Returns:
             Dict with success status and trade details
         """
-        start_time = datetime.now()
+        deadline = time.monotonic() + timeout_seconds
+        delay = poll_interval
         
-        while (datetime.now() - start_time).total_seconds() < timeout_seconds:
+        # Give API time to update
+        await asyncio.sleep(min(initial_delay, timeout_seconds))
+        
+        while time.monotonic() < deadline:
             try:
-                # Check recent trades - need to await a bit for API to update
-                if (datetime.now() - start_time).total_seconds() < 1:
-                    await asyncio.sleep(1)  # Give API time to update
-                
                 trades = await self.rise_client.get_account_trade_history(account, limit=10)
                 
                 for trade in trades:
@@ -94,8 +103,9 @@ class OrderTracker:
             except Exception as e:
                 print(f"Error checking order {order_id}: {e}")
             
-            # Wait before retrying
-            await asyncio.sleep(1)
+            # Wait before retrying, backing off if max_poll_interval allows
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, max_poll_interval)
         
         # Timeout - order not found
         return {
@@ -192,4 +202,5 @@ class OrderTracker:
     
     async def close(self):
         """Cleanup."""
-        await self.rise_client.close()
\ No newline at end of file
+        if self._owns_client:
+            await self.rise_client.close()
\ No newline at end of file
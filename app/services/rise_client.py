@@ -1,18 +1,25 @@
 """RISE API client with gasless trading support."""
 
 import asyncio
+import importlib.util
 import random
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
-from eth_abi.packed import encode_packed
 from eth_account import Account as EthAccount
 from eth_account.messages import encode_structured_data
-from eth_utils import keccak
+from eth_hash.auto import keccak
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import settings
+from ..models import Market
+from ..utils.jsonio import json_loads
+from ..utils.keys import address_from_key
+
+
+# HTTP/2 needs the h2 package (httpx[http2]); without it fall back to HTTP/1.1
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class RiseAPIError(Exception):
@@ -27,41 +34,72 @@ class RiseAPIError(Exception):
 class RiseClient:
     """Simplified RISE API client for gasless trading."""
     
+    # EIP-712 domain is fixed per deployment, so it is shared across instances
+    _domain_cache: Dict[str, Dict[str, Any]] = {}
+    
+    MARKETS_TTL = 30.0  # seconds
+    PRICES_TTL = 2.0  # seconds
+    
     def __init__(self):
         self.base_url = settings.rise_api_base
         self.chain_id = settings.rise_chain_id
         self.domain: Optional[Dict] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Short-lived responses keyed by name: (expires_at, value)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+        self._cache_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.markets_by_id: Dict[int, Dict[str, Any]] = {}
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, creating it on first use in this event loop."""
+        loop = asyncio.get_running_loop()
+        # Pooled connections are bound to the loop that opened them
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+            )
+            self._http_loop = loop
+        return self._http
     
     async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling."""
-        async with httpx.AsyncClient() as client:
+        client = self._get_http_client()
+        try:
+            response = await client.request(
+                method, f"{self.base_url}{path}", **kwargs
+            )
+            response.raise_for_status()
+            return json_loads(response.content)
+        except httpx.HTTPStatusError as e:
+            error_detail = f"HTTP {e.response.status_code}"
             try:
-                response = await client.request(
-                    method, f"{self.base_url}{path}", **kwargs, timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                error_detail = f"HTTP {e.response.status_code}"
-                try:
-                    error_data = e.response.json()
-                    error_detail = error_data.get("message", error_detail)
-                    # Include more error details
-                    if "error" in error_data:
-                        error_detail = f"{error_detail}: {error_data['error']}"
-                    if "details" in error_data:
-                        error_detail = f"{error_detail} - {error_data['details']}"
-                except Exception:
-                    error_detail = f"{error_detail}: {e.response.text[:200]}"
-                raise RiseAPIError(f"API request failed: {error_detail}", e.response.status_code)
-            except Exception as e:
-                raise RiseAPIError(f"Request failed: {str(e)}")
+                error_data = json_loads(e.response.content)
+                error_detail = error_data.get("message", error_detail)
+                # Include more error details
+                if "error" in error_data:
+                    error_detail = f"{error_detail}: {error_data['error']}"
+                if "details" in error_data:
+                    error_detail = f"{error_detail} - {error_data['details']}"
+            except Exception:
+                error_detail = f"{error_detail}: {e.response.text[:200]}"
+            raise RiseAPIError(f"API request failed: {error_detail}", e.response.status_code)
+        except Exception as e:
+            raise RiseAPIError(f"Request failed: {str(e)}")
     
     async def get_eip712_domain(self) -> Dict[str, Any]:
         """Get EIP-712 domain for message signing."""
         if self.domain:
             return self.domain
         
+        cached = self._domain_cache.get(self.base_url)
+        if cached:
+            self.domain = cached
+            return self.domain
+        
         response = await self._request("GET", "/v1/auth/eip712-domain")
         raw_domain = response["data"]
         
@@ -72,6 +110,7 @@ class RiseClient:
             "chainId": int(raw_domain["chain_id"]),
             "verifyingContract": raw_domain["verifying_contract"],
         }
+        self._domain_cache[self.base_url] = self.domain
         return self.domain
     
     async def get_account_nonce(self, account: str) -> int:
@@ -169,10 +208,61 @@ class RiseClient:
             }
         )
     
-    async def get_markets(self) -> List[Dict[str, Any]]:
-        """Get available trading markets."""
+    async def _cached(self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, calling loader at most once per expiry.
+        
+        Concurrent callers for the same key wait on the first fetch instead of
+        issuing their own.
+        """
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        # Locks are bound to the loop that first waits on them
+        loop = asyncio.get_running_loop()
+        if self._cache_loop is not loop:
+            self._cache_locks = {}
+            self._cache_loop = loop
+        
+        async with self._cache_locks.setdefault(key, asyncio.Lock()):
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            value = await loader()
+            self._cache[key] = (time.monotonic() + ttl, value)
+            return value
+    
+    async def _fetch_markets(self) -> List[Dict[str, Any]]:
+        """Fetch the market list and rebuild the by-ID index."""
         response = await self._request("GET", "/v1/markets")
-        return response.get("data", {}).get("markets", [])
+        markets = response.get("data", {}).get("markets", [])
+        self.markets_by_id = {
+            int(m["market_id"]): m for m in markets if m.get("market_id") is not None
+        }
+        return markets
+    
+    async def get_markets(self, fresh: bool = False) -> List[Dict[str, Any]]:
+        """Get available trading markets (cached for MARKETS_TTL seconds).
+        
+        The cached list is only suitable for market metadata. Callers that
+        read last_price or other live fields pass fresh=True, which fetches
+        the list and refreshes the cache, or read it right after such a fetch.
+        """
+        if fresh:
+            markets = await self._fetch_markets()
+            self._cache["markets"] = (time.monotonic() + self.MARKETS_TTL, markets)
+            return list(markets)
+        return list(await self._cached("markets", self.MARKETS_TTL, self._fetch_markets))
+    
+    async def get_market(self, market_id: int) -> Optional[Market]:
+        """Get a single market by ID, or None if it is not listed."""
+        await self.get_markets()
+        market = self.markets_by_id.get(market_id)
+        return Market.from_api(market) if market else None
+    
+    async def get_market_models(self) -> List[Market]:
+        """Get available trading markets as typed Market models."""
+        return [Market.from_api(m) for m in await self.get_markets()]
     
     async def get_position(self, account: str, market_id: int) -> Dict[str, Any]:
         """Get account position for specific market."""
@@ -293,31 +383,49 @@ class RiseClient:
         if check_success and result and "data" in result:
             order_id = result["data"].get("order_id")
             if order_id:
-                # Import here to avoid circular dependency
-                from .order_tracker import OrderTracker
-                
-                account = EthAccount.from_key(account_key)
-                tracker = OrderTracker()
+                # Check if order was filled
+                success_check = await self.wait_for_fill(
+                    address_from_key(account_key), order_id, timeout=10
+                )
                 
-                try:
-                    # Check if order was filled
-                    success_check = await tracker.check_order_success(
-                        account=account.address,
-                        order_id=order_id,
-                        expected_side=side,
-                        expected_size=size,
-                        timeout_seconds=10
-                    )
-                    
-                    # Add success info to result
-                    result["order_filled"] = success_check.get("success", False)
-                    if success_check.get("success"):
-                        result["fill_details"] = success_check
-                finally:
-                    await tracker.close()
+                # Add success info to result
+                result["order_filled"] = success_check.get("success", False)
+                if success_check.get("success"):
+                    result["fill_details"] = success_check
         
         return result
     
+    async def wait_for_fill(
+        self,
+        account: str,
+        order_id: str,
+        timeout: float = 5.0,
+        initial_delay: float = 1.0,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 1.0
+    ) -> Dict[str, Any]:
+        """Wait until an order shows up as filled, cancelled or expired.
+        
+        Polls trade history and orders through OrderTracker on this client's
+        connection pool and returns as soon as the order is resolved. The
+        polling defaults suit production; see OrderTracker.check_order_success.
+        
+        Returns:
+            OrderTracker result dict; "success" is True once the order filled
+        """
+        # Import here to avoid circular dependency
+        from .order_tracker import OrderTracker
+        
+        tracker = OrderTracker(self)
+        return await tracker.check_order_success(
+            account=account,
+            order_id=order_id,
+            timeout_seconds=timeout,
+            initial_delay=initial_delay,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval
+        )
+    
     async def close_position(
         self,
         account_key: str,
@@ -360,11 +468,15 @@ class RiseClient:
         )
     
     async def get_market_prices(self) -> Dict[str, float]:
-        """Get current market prices for BTC and ETH.
+        """Get current market prices for BTC and ETH (cached for PRICES_TTL seconds).
         
         Returns:
             Dict with 'BTC' and 'ETH' prices
         """
+        return dict(await self._cached("prices", self.PRICES_TTL, self._fetch_market_prices))
+    
+    async def _fetch_market_prices(self) -> Dict[str, float]:
+        """Fetch BTC and ETH prices, skipping any that are unavailable."""
         prices = {}
         
         try:
@@ -516,7 +628,7 @@ class RiseClient:
         Returns:
             Order response with order_id, transaction_hash, etc.
         """
-        if EthAccount.from_key(account_key).address == EthAccount.from_key(signer_key).address:
+        if address_from_key(account_key) == address_from_key(signer_key):
             raise ValueError("Account and signer must be different addresses")
         
         account = EthAccount.from_key(account_key)
@@ -550,14 +662,9 @@ class RiseClient:
             (0 << 3)  # bits 3-4: STP mode (cancel taker)
         )
         
-        encoded_order = encode_packed(
-            ["uint64", "uint128", "uint128", "uint8", "uint8", "uint8", "uint32"],
-            [market_id, size_raw, price_raw, flags, order_type_int, tif, expiry],
+        encoded_order = self._encode_order(
+            market_id, size_raw, price_raw, flags, order_type_int, tif, expiry
         )
-        
-        if len(encoded_order) != 47:
-            raise ValueError(f"Encoded order length is {len(encoded_order)}, expected 47 bytes")
-        
         order_hash = keccak(encoded_order)
         
         # Create permit signature (signer signs)
@@ -672,6 +779,29 @@ class RiseClient:
         
         return bytes(sig).hex()
     
+    def _encode_order(
+        self,
+        market_id: int,
+        size_raw: int,
+        price_raw: int,
+        flags: int,
+        order_type: int,
+        tif: int,
+        expiry: int,
+    ) -> bytes:
+        """Pack order fields into the 47-byte hashing format.
+        
+        Equivalent to abi.encodePacked(uint64, uint128, uint128, uint8, uint8,
+        uint8, uint32); raises OverflowError if a field does not fit its width.
+        """
+        return (
+            market_id.to_bytes(8, "big")
+            + size_raw.to_bytes(16, "big")
+            + price_raw.to_bytes(16, "big")
+            + bytes((flags, order_type, tif))
+            + expiry.to_bytes(4, "big")
+        )
+    
     def _create_client_nonce(self, address: str) -> int:
         """Create a unique client nonce following RISE API specification."""
         # Milliseconds + 6 random digits to simulate nanoseconds
@@ -696,8 +826,11 @@ class RiseClient:
         return int(base_nonce[:-6] + str(hash_val)[-6:])
     
     async def close(self):
-        """Cleanup method for async context manager."""
-        pass
+        """Close the pooled HTTP client."""
+        if self._http is not None and self._http_loop is asyncio.get_running_loop():
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
     
     async def __aenter__(self):
         return self
@@ -732,7 +865,7 @@ class RiseClient:
     
     async def get_realtime_market_prices(self) -> Dict[str, float]:
         """Get real-time prices for all markets."""
-        markets = await self.get_markets()
+        markets = await self.get_markets(fresh=True)
         prices = {}
         
         for market in markets:
@@ -763,7 +896,7 @@ class RiseClient:
     
     async def get_enhanced_market_data(self) -> Dict[str, Any]:
         """Get comprehensive market data with prices and changes."""
-        markets = await self.get_markets()
+        markets = await self.get_markets(fresh=True)
         market_data = {}
         
         for market in markets:
@@ -1,12 +1,15 @@
 """Simple JSON file storage for the RISE AI trading bot."""
 
 import json
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..models import Account, Persona, Trade, TradingDecisionLog, TradingSession, Position
 from ..pending_actions import PendingAction, ActionStatus
+from ..utils.jsonio import json_dumps_pretty, json_loads
+from ..utils.pnl import compute_pnl_totals
 
 
 class StorageError(Exception):
@@ -36,15 +39,53 @@ class JSONStorage:
         self.sessions_file = self.data_dir / "trading_sessions.json"
         self.pending_actions_file = self.data_dir / "pending_actions.json"
         self.positions_file = self.data_dir / "positions.json"
+        
+        # Parsed file contents keyed by path, valid while (mtime, size) match
+        self._read_cache: Dict[Path, Tuple[Tuple[int, int], Dict]] = {}
+        self._accounts_cache: Optional[Tuple[Tuple[int, int], List[Account]]] = None
+        self._accounts_by_address: Dict[str, Account] = {}
+        # Writes held back by batch(), keyed by path
+        self._pending: Optional[Dict[Path, Dict]] = None
+    
+    @staticmethod
+    def _file_key(file_path: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) for a file, or None if it does not exist."""
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _load_json_cached(self, file_path: Path) -> Dict:
+        """Load JSON for read-only use, reusing the last parse if the file is unchanged.
+        
+        Callers must not mutate the returned dict.
+        """
+        if self._pending is not None and file_path in self._pending:
+            return self._pending[file_path]
+        
+        key = self._file_key(file_path)
+        if key is None:
+            return {}
+        
+        cached = self._read_cache.get(file_path)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        data = self._load_json(file_path)
+        self._read_cache[file_path] = (key, data)
+        return data
     
     def _load_json(self, file_path: Path) -> Dict:
         """Load JSON data from file with error recovery."""
+        if self._pending is not None and file_path in self._pending:
+            return self._pending[file_path]
+        
         if not file_path.exists():
             return {}
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_loads(file_path.read_bytes())
         except json.JSONDecodeError as e:
             # Handle corrupted JSON by backing up and resetting
             print(f"WARNING: Corrupted JSON in {file_path.name}: {e}")
@@ -72,16 +113,49 @@ class JSONStorage:
     
     def _save_json(self, file_path: Path, data: Dict) -> None:
         """Save JSON data to file."""
+        self._read_cache.pop(file_path, None)
+        if file_path == self.accounts_file:
+            self._accounts_cache = None
+        
+        if self._pending is not None:
+            self._pending[file_path] = data
+            return
+        
         try:
             # Ensure parent directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Write with pretty formatting
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str, ensure_ascii=False)
-        except IOError as e:
+            file_path.write_bytes(json_dumps_pretty(data))
+        except (IOError, ValueError) as e:
             raise StorageError(f"Failed to save {file_path.name}: {e}")
     
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer writes until the outermost batch exits, then write each file once.
+        
+        Reads inside the batch see the pending data. If the block raises, the
+        pending writes are dropped so a half-finished batch never reaches disk.
+        """
+        outermost = self._pending is None
+        if outermost:
+            self._pending = {}
+        try:
+            yield
+        except BaseException:
+            if outermost:
+                pending, self._pending = self._pending, None
+                # Cached reads may have been built from the discarded data
+                for file_path in pending:
+                    self._read_cache.pop(file_path, None)
+                if self.accounts_file in pending:
+                    self._accounts_cache = None
+            raise
+        if outermost:
+            pending, self._pending = self._pending, None
+            for file_path, data in pending.items():
+                self._save_json(file_path, data)
+    
     # Account management
     def save_account(self, account_id_or_obj, account_data=None) -> None:
         """Save account to storage. Can accept Account object or (account_id, account_dict)."""
@@ -96,6 +170,13 @@ class JSONStorage:
             
         self._save_json(self.accounts_file, accounts)
     
+    def save_accounts(self, accounts: Iterable[Account]) -> None:
+        """Save many accounts with a single read and write of the accounts file."""
+        data = self._load_json(self.accounts_file)
+        for account in accounts:
+            data[account.id] = account.model_dump()
+        self._save_json(self.accounts_file, data)
+    
     def get_account(self, account_id: str) -> Optional[Account]:
         """Get account by ID."""
         accounts = self._load_json(self.accounts_file)
@@ -109,23 +190,66 @@ class JSONStorage:
         except Exception as e:
             raise StorageError(f"Failed to load account {account_id}: {e}")
     
+    def get_account_by_address(self, address: str) -> Optional[Account]:
+        """Get account by wallet address (case-insensitive)."""
+        self._cached_accounts()
+        account = self._accounts_by_address.get(address.lower())
+        return account.model_copy() if account else None
+    
     def get_all_accounts(self) -> Dict[str, Dict]:
         """Get all accounts as raw dict data."""
         return self._load_json(self.accounts_file)
     
+    def _cached_accounts(self) -> List[Account]:
+        """Return the shared account models, rebuilding them and the address index on change.
+        
+        Callers must not mutate the returned models.
+        """
+        key = self._file_key(self.accounts_file)
+        if self._accounts_cache is None or self._accounts_cache[0] != key:
+            accounts = list(self.iter_accounts())
+            self._accounts_cache = (key, accounts)
+            self._accounts_by_address = {acc.address.lower(): acc for acc in accounts}
+        return self._accounts_cache[1]
+    
     def list_accounts(self) -> List[Account]:
         """List all accounts."""
-        accounts = self._load_json(self.accounts_file)
+        # Hand out copies so callers can modify accounts without touching the cache
+        return [account.model_copy() for account in self._cached_accounts()]
+    
+    def list_accounts_filtered(
+        self, active: Optional[bool] = None, deposited: Optional[bool] = None
+    ) -> List[Account]:
+        """List accounts matching the given is_active / has_deposited flags (None = any)."""
+        return [
+            account.model_copy()
+            for account in self._cached_accounts()
+            if (active is None or account.is_active == active)
+            and (deposited is None or account.has_deposited == deposited)
+        ]
+    
+    def find_signer_account(self) -> Optional[Account]:
+        """Get the first account with a signer key distinct from its private key."""
+        for account in self._cached_accounts():
+            if account.signer_key and account.signer_key != account.private_key:
+                return account.model_copy()
+        return None
+    
+    def iter_accounts(self, reverse: bool = False) -> Iterator[Account]:
+        """Yield accounts lazily in file order (reversed if reverse=True).
         
-        result = []
-        for account_id, account_data in accounts.items():
+        Models are only built as they are consumed, so callers that stop
+        early (next(), islice) skip validating the rest of the file.
+        """
+        accounts = self._load_json_cached(self.accounts_file)
+        items = reversed(accounts.items()) if reverse else accounts.items()
+        
+        for account_id, account_data in items:
             try:
-                result.append(Account(**account_data))
+                yield Account(**account_data)
             except Exception as e:
                 print(f"Warning: Skipping corrupted account {account_id}: {e}")
                 continue
-        
-        return result
     
     def delete_account(self, account_id: str) -> bool:
         """Delete account from storage."""
@@ -152,7 +276,7 @@ class JSONStorage:
     
     def get_trades(self, account_id: str, limit: int = 50) -> List[Trade]:
         """Get trades for account, most recent first."""
-        trades = self._load_json(self.trades_file)
+        trades = self._load_json_cached(self.trades_file)
         account_trades = trades.get(account_id, [])
         
         # Sort by timestamp (most recent first) and limit
@@ -716,6 +840,18 @@ class JSONStorage:
         positions[position.account_id].append(position_data)
         self._save_json(self.positions_file, positions)
     
+    def save_position_snapshots(self, positions: Iterable[Position]) -> None:
+        """Save many position snapshots with a single read and write."""
+        data = self._load_json(self.positions_file)
+        snapshot_time = datetime.utcnow().isoformat()
+        
+        for position in positions:
+            position_data = position.model_dump()
+            position_data["snapshot_time"] = snapshot_time
+            data.setdefault(position.account_id, []).append(position_data)
+        
+        self._save_json(self.positions_file, data)
+    
     def get_latest_positions(self, account_id: str) -> List[Position]:
         """Get the most recent position snapshot for an account."""
         positions = self._load_json(self.positions_file)
@@ -768,13 +904,12 @@ class JSONStorage:
         """Get total P&L for an account from latest positions."""
         positions = self.get_latest_positions(account_id)
         
-        total_unrealized = sum(p.unrealized_pnl for p in positions)
-        total_realized = sum(p.realized_pnl for p in positions)
+        total_unrealized, total_realized, total_pnl = compute_pnl_totals(positions)
         
         return {
             "unrealized_pnl": total_unrealized,
             "realized_pnl": total_realized,
-            "total_pnl": total_unrealized + total_realized
+            "total_pnl": total_pnl
         }
     
     def update_decision_outcome(self, decision_id: str, trade_id: str, pnl: float, status: str) -> None:
@@ -0,0 +1,57 @@
+"""Fast JSON encode/decode with orjson, falling back to the stdlib where it differs."""
+
+import json
+import math
+import re
+from typing import Any
+
+import orjson
+
+# Unquoted integers that may fall outside orjson's int64/uint64 range, which it
+# would turn into floats: 20+ digits, or 19+ digits below the int64 minimum
+_BIG_INT = re.compile(rb'(?:^|[:,\[])\s*(?:-\d{19}|\d{20})')
+
+# Datetimes go through default=str so files keep the stdlib's "YYYY-MM-DD HH:MM:SS" form
+_PRETTY_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def json_loads(content: bytes) -> Any:
+    """Decode JSON with orjson, keeping exact big ints via the stdlib.
+
+    Content orjson rejects, such as the NaN/Infinity tokens json.dump writes
+    by default, is decoded by the stdlib too.
+    """
+    if _BIG_INT.search(content):
+        return json.loads(content)
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+def _check_finite(data: Any) -> None:
+    """Raise ValueError if data holds a NaN or infinite float, which orjson writes as null."""
+    if isinstance(data, float):
+        if not math.isfinite(data):
+            raise ValueError(f"Out of range float values are not JSON compliant: {data!r}")
+    elif isinstance(data, dict):
+        for value in data.values():
+            _check_finite(value)
+    elif isinstance(data, (list, tuple)):
+        for value in data:
+            _check_finite(value)
+
+
+def json_dumps_pretty(data: Any) -> bytes:
+    """Encode JSON as UTF-8 with 2-space indent, like json.dump(indent=2, default=str).
+
+    Output matches the stdlib except for float exponents (1e16, not 1e+16).
+    NaN and infinite floats raise ValueError instead of being written, so a bad
+    value fails here rather than as an unreadable record on the next load.
+    Falls back to the stdlib for values orjson rejects, such as ints wider than 64 bits.
+    """
+    _check_finite(data)
+    try:
+        return orjson.dumps(data, default=str, option=_PRETTY_OPTIONS)
+    except orjson.JSONEncodeError:
+        return json.dumps(data, indent=2, default=str, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,15 @@
+"""Private key helpers."""
+
+from functools import lru_cache
+
+from eth_account import Account as EthAccount
+
+
+@lru_cache(maxsize=4096)
+def address_from_key(private_key: str) -> str:
+    """Derive the checksummed address for a private key.
+    
+    Derivation is a secp256k1 point multiplication, so results are memoized
+    per key string.
+    """
+    return EthAccount.from_key(private_key).address
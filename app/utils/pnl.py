@@ -0,0 +1,20 @@
+"""P&L aggregation helpers."""
+
+import math
+from typing import Sequence, Tuple
+
+from ..models import Position
+
+
+def compute_pnl_totals(positions: Sequence[Position]) -> Tuple[float, float, float]:
+    """Sum P&L across positions.
+    
+    Uses math.fsum so the totals are exactly rounded regardless of how many
+    positions there are or in which order they come.
+    
+    Returns:
+        (unrealized, realized, total)
+    """
+    unrealized = math.fsum(p.unrealized_pnl for p in positions)
+    realized = math.fsum(p.realized_pnl for p in positions)
+    return unrealized, realized, unrealized + realized
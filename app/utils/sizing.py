@@ -0,0 +1,24 @@
+"""Order sizing helpers."""
+
+from typing import Optional, Tuple
+
+
+def compute_order_raw(
+    balance: float,
+    pct: float,
+    price: float,
+    limit_price: Optional[float] = None,
+) -> Tuple[int, int]:
+    """Size a position at pct of balance and convert it to 18-decimal units.
+    
+    The size is derived from ``price``; ``limit_price`` (defaults to ``price``)
+    is the price actually sent with the order. Everything stays in float until
+    the final int() so the intermediates cannot overflow.
+    
+    Returns:
+        (size_raw, price_raw)
+    """
+    if limit_price is None:
+        limit_price = price
+    size = balance * pct / price
+    return int(size * 1e18), int(limit_price * 1e18)
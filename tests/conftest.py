@@ -0,0 +1,24 @@
+"""Shared pytest fixtures for the RISE AI trading bot tests.
+
+Only test_full_flow and test_ai_trading use the session-scoped market_manager;
+they run on the session event loop via pytest.mark.asyncio(loop_scope="session").
+"""
+
+import sys
+from pathlib import Path
+
+import pytest_asyncio
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def market_manager():
+    """Warm global market manager shared by every test that asks for it."""
+    # Imported here so pure unit tests collect without the full app stack
+    from app.core.market_manager import get_market_manager
+    
+    manager = get_market_manager()
+    await manager.get_latest_data(force_update=True)
+    yield manager
+    await manager.close()
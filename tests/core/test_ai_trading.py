@@ -6,11 +6,14 @@ import json
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.rise_client import RiseClient
 from app.services.storage import JSONStorage
 from app.core.market_manager import get_market_manager
+from app.utils.keys import address_from_key
 from eth_account import Account as EthAccount
 from eth_abi.packed import encode_packed
 from eth_utils import keccak
@@ -43,7 +46,8 @@ async def ai_trading_decision(market_data):
         return "long", "BTC", "Accumulating during consolidation 📊"
 
 
-async def test_ai_trading():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ai_trading(market_manager):
     """Test AI-driven trading flow."""
     print("RISE AI Trading Test")
     print("=" * 80)
@@ -51,7 +55,6 @@ async def test_ai_trading():
     # Initialize services
     rise_client = RiseClient()
     storage = JSONStorage()
-    market_manager = get_market_manager()
     
     # Get first account (should be funded from previous tests)
     accounts = storage.list_accounts()
@@ -61,16 +64,17 @@ async def test_ai_trading():
     
     account = accounts[0]  # Use first account that we funded earlier
     print(f"\n👤 Using account: {account.address}")
-    print(f"   Signer: {EthAccount.from_key(account.signer_key).address}")
+    print(f"   Signer: {address_from_key(account.signer_key)}")
     
     # Get market data
     print("\n📊 Fetching market data...")
-    await market_manager.get_latest_data(force_update=True)
+    await market_manager.get_latest_data()
     
+    mc = market_manager.market_cache
     market_data = {
-        "btc_price": market_manager.market_cache.get("btc_price", 90000),
-        "eth_price": market_manager.market_cache.get("eth_price", 3000),
-        "btc_change": market_manager.market_cache.get("btc_change", 0),
+        "btc_price": mc.get("btc_price", 90000),
+        "eth_price": mc.get("eth_price", 3000),
+        "btc_change": mc.get("btc_change", 0),
     }
     
     # AI makes trading decision
@@ -84,12 +88,14 @@ async def test_ai_trading():
         position_size = 0.01  # 0.01 BTC
         order_price = market_data["btc_price"] * 0.99  # 1% below market
         
-        print(f"\n📝 Placing order:")
-        print(f"   Asset: {asset}")
-        print(f"   Side: BUY (Long)")
-        print(f"   Size: {position_size} BTC")
-        print(f"   Price: ${order_price:,.2f}")
-        print(f"   Value: ${position_size * order_price:,.2f}")
+        print(
+            f"\n📝 Placing order:\n"
+            f"   Asset: {asset}\n"
+            f"   Side: BUY (Long)\n"
+            f"   Size: {position_size} BTC\n"
+            f"   Price: ${order_price:,.2f}\n"
+            f"   Value: ${position_size * order_price:,.2f}"
+        )
         
         # Place order with IOC (which we know works)
         account_obj = EthAccount.from_key(account.private_key)
@@ -203,9 +209,17 @@ async def test_ai_trading():
     
     # Clean up
     await rise_client.close()
-    await market_manager.close()
+
+
+async def main():
+    """Run the test standalone with its own market manager."""
+    market_manager = get_market_manager()
+    try:
+        await test_ai_trading(market_manager)
+    finally:
+        await market_manager.close()
 
 
 if __name__ == "__main__":
     print(f"Starting AI trading test at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    asyncio.run(test_ai_trading())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -2,21 +2,66 @@
 """Full flow test: Create profile, setup, and AI-driven order placement."""
 
 import asyncio
-import json
+import io
 import sys
 import time
 from pathlib import Path
 
+import orjson
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.utils.profile_generator import ProfileGenerator
 from app.services.rise_client import RiseClient
 from app.services.storage import JSONStorage
 from app.core.market_manager import get_market_manager
-from eth_account import Account as EthAccount
+from app.utils.sizing import compute_order_raw
+
+
+# EIP-712 types for the order permit signature used by the IOC retry
+VERIFY_SIG_TYPES = {
+    "EIP712Domain": [
+        {"name": "name", "type": "string"},
+        {"name": "version", "type": "string"},
+        {"name": "chainId", "type": "uint256"},
+        {"name": "verifyingContract", "type": "address"},
+    ],
+    "VerifySignature": [
+        {"name": "account", "type": "address"},
+        {"name": "target", "type": "address"},
+        {"name": "hash", "type": "bytes32"},
+        {"name": "nonce", "type": "uint256"},
+        {"name": "deadline", "type": "uint256"},
+    ],
+}
+
+
+async def wait_for_balance(
+    rise_client: RiseClient,
+    address: str,
+    min_usd: float,
+    timeout: float = 10,
+    interval: float = 0.5,
+) -> bool:
+    """Poll the cross-margin balance until it reaches min_usd or timeout expires."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    
+    while loop.time() < deadline:
+        await asyncio.sleep(interval)
+        try:
+            balance = await rise_client.get_balance(address)
+            if float(balance.get("cross_margin_balance", 0)) >= min_usd:
+                return True
+        except Exception:
+            pass  # Account may not be visible yet
+    
+    return False
 
 
-async def test_full_flow():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_full_flow(market_manager):
     """Test complete flow from profile creation to AI trading."""
     print("RISE Full Flow Test")
     print("=" * 80)
@@ -34,7 +79,7 @@ async def test_full_flow():
     
     if not profile_result["setup"]["signer_registered"]:
         print("❌ Signer registration failed!")
-        print(json.dumps(profile_result, indent=2))
+        print(orjson.dumps(profile_result, option=orjson.OPT_INDENT_2).decode())
         return
     
     if not profile_result["setup"]["deposit_success"]:
@@ -47,22 +92,31 @@ async def test_full_flow():
     print(f"   Deposit: ${profile_result['setup']['deposit_amount']} USDC")
     print(f"   Deposit TX: {profile_result['setup']['deposit_tx']}")
     
-    # Wait for deposit to settle
-    print("\nWaiting 10 seconds for deposit to settle...")
-    await asyncio.sleep(10)
+    # Wait for deposit to settle, fetching market data in the meantime
+    print("\nWaiting up to 10 seconds for deposit to settle...")
+    deposit_settled, _ = await asyncio.gather(
+        wait_for_balance(
+            generator.rise_client,
+            profile_result['profile']['address'],
+            profile_result['setup']['deposit_amount'],
+        ),
+        market_manager.get_latest_data(),
+    )
+    if not deposit_settled:
+        print("⚠️  Deposit not reflected in balance yet, continuing...")
     
     # Step 2: Initialize market data
     print("\n2. Fetching market data...")
     print("-" * 60)
     
-    market_manager = get_market_manager()
-    await market_manager.get_latest_data(force_update=True)
-    
-    btc_price = market_manager.market_cache.get("btc_price", 90000)
-    eth_price = market_manager.market_cache.get("eth_price", 3000)
+    mc = market_manager.market_cache
+    btc_price = mc.get("btc_price", 90000)
+    eth_price = mc.get("eth_price", 3000)
     
-    print(f"BTC Price: ${btc_price:,.0f}")
-    print(f"ETH Price: ${eth_price:,.0f}")
+    print(
+        f"BTC Price: ${btc_price:,.0f}\n"
+        f"ETH Price: ${eth_price:,.0f}"
+    )
     
     # Step 3: AI Trading Decision
     print("\n3. AI Trading Analysis...")
@@ -70,13 +124,7 @@ async def test_full_flow():
     
     # Get the newly created account
     storage = JSONStorage()
-    accounts = storage.list_accounts()
-    new_account = None
-    
-    for acc in accounts:
-        if acc.address == profile_result['profile']['address']:
-            new_account = acc
-            break
+    new_account = storage.get_account_by_address(profile_result['profile']['address'])
     
     if not new_account:
         print("❌ Could not find new account in storage!")
@@ -106,21 +154,13 @@ async def test_full_flow():
     print("\n4. Placing BTC long order...")
     print("-" * 60)
     
-    rise_client = RiseClient()
-    
-    # Place limit order slightly below market for better fill
-    order_price = btc_price * 0.995  # 0.5% below market
-    
-    print(f"Order details:")
-    print(f"  Market: BTC/USDC")
-    print(f"  Side: BUY (Long)")
-    print(f"  Type: Limit")
-    print(f"  Size: {btc_size:.4f} BTC")
-    print(f"  Price: ${order_price:,.2f}")
-    print(f"  TIF: IOC (Immediate or Cancel)")
-    
-    try:
-        result = await rise_client.place_order(
+    async with RiseClient() as rise_client:
+        
+        # Place limit order slightly below market for better fill
+        order_price = btc_price * 0.995  # 0.5% below market
+        
+        # Submit first and print while the request is in flight
+        order_task = asyncio.create_task(rise_client.place_order(
             account_key=new_account.private_key,
             signer_key=new_account.signer_key,
             market_id=1,  # BTC
@@ -130,147 +170,187 @@ async def test_full_flow():
             order_type="limit",
             post_only=False,
             reduce_only=False
-        )
-        
-        print("\n✅ Order placed successfully!")
-        print(f"   Order ID: {result.get('order_id', 'N/A')}")
-        print(f"   Transaction: {result.get('transaction_hash', 'N/A')}")
+        ))
+        await asyncio.sleep(0)  # Let the task sign and send before printing
         
-        # Extract order details
-        if 'order' in result:
-            order = result['order']
-            print(f"\nOrder status:")
-            print(f"   Size: {float(order.get('size', 0)) / 1e18:.4f} BTC")
-            print(f"   Filled: {float(order.get('filled_size', 0)) / 1e18:.4f} BTC")
-            print(f"   Status: {order.get('status', 'Unknown')}")
-        
-    except Exception as e:
-        print(f"\n❌ Order failed: {e}")
+        print(
+            f"Order details:\n"
+            f"  Market: BTC/USDC\n"
+            f"  Side: BUY (Long)\n"
+            f"  Type: Limit\n"
+            f"  Size: {btc_size:.4f} BTC\n"
+            f"  Price: ${order_price:,.2f}\n"
+            f"  TIF: IOC (Immediate or Cancel)"
+        )
         
-        # If it's the TIF error, retry with IOC
-        if "InvalidTimeInForceForMarketOrder" in str(e) or "GTC" in str(e):
-            print("\nRetrying with IOC time-in-force...")
-            
-            # We need to manually set TIF to IOC
-            # For now, let's use the working configuration
-            from eth_abi.packed import encode_packed
-            from eth_utils import keccak
+        try:
+            result = await order_task
             
-            account_obj = EthAccount.from_key(new_account.private_key)
-            signer_obj = EthAccount.from_key(new_account.signer_key)
+            print("\n✅ Order placed successfully!")
+            print(f"   Order ID: {result.get('order_id', 'N/A')}")
+            print(f"   Transaction: {result.get('transaction_hash', 'N/A')}")
             
-            domain = await rise_client.get_eip712_domain()
+            # Extract order details
+            if 'order' in result:
+                order = result['order']
+                print(f"\nOrder status:")
+                print(f"   Size: {float(order.get('size', 0)) / 1e18:.4f} BTC")
+                print(f"   Filled: {float(order.get('filled_size', 0)) / 1e18:.4f} BTC")
+                print(f"   Status: {order.get('status', 'Unknown')}")
             
-            # Order parameters
-            market_id = 1
-            size_raw = int(btc_size * 1e18)
-            price_raw = int(order_price * 1e18)
-            
-            side_int = 0  # buy
-            order_type_int = 0  # limit
-            tif = 3  # IOC
-            expiry = 0
-            
-            # Encode order
-            flags = (
-                side_int |
-                (0 << 1) |  # post_only = false
-                (0 << 2) |  # reduce_only = false
-                (0 << 3)    # stp_mode = 0
+            # Read back account state in one round-trip
+            address = profile_result['profile']['address']
+            balance, positions, orders = await asyncio.gather(
+                rise_client.get_balance(address),
+                rise_client.get_all_positions(address),
+                rise_client.get_orders(address, limit=10),
+                return_exceptions=True,
             )
             
-            encoded_order = encode_packed(
-                ["uint64", "uint128", "uint128", "uint8", "uint8", "uint8", "uint32"],
-                [market_id, size_raw, price_raw, flags, order_type_int, tif, expiry]
-            )
+            print(f"\nPost-order verification:")
+            if isinstance(balance, Exception):
+                print(f"   Balance: error ({balance})")
+            else:
+                print(f"   Balance: ${float(balance.get('cross_margin_balance', 0)):,.2f}")
+            if isinstance(positions, Exception):
+                print(f"   Positions: error ({positions})")
+            else:
+                print(f"   Positions: {len(positions)} found")
+            if isinstance(orders, Exception):
+                print(f"   Order: error ({orders})")
+            else:
+                order_id = str(result.get('order_id'))
+                placed = next((o for o in orders if str(o.get('id')) == order_id), None)
+                print(f"   Order: {placed.get('status', 'Unknown') if placed else 'not found'}")
             
-            order_hash = keccak(encoded_order)
+        except Exception as e:
+            print(f"\n❌ Order failed: {e}")
             
-            # Create signature
-            nonce = rise_client._create_client_nonce(account_obj.address)
-            deadline = int(time.time()) + 300
-            target = "0x68cAcD54a8c93A3186BF50bE6b78B761F728E1b4"
-            
-            verify_sig_data = {
-                "domain": domain,
-                "message": {
-                    "account": account_obj.address,
-                    "target": target,
-                    "hash": order_hash,
-                    "nonce": nonce,
-                    "deadline": deadline,
-                },
-                "primaryType": "VerifySignature",
-                "types": {
-                    "EIP712Domain": [
-                        {"name": "name", "type": "string"},
-                        {"name": "version", "type": "string"},
-                        {"name": "chainId", "type": "uint256"},
-                        {"name": "verifyingContract", "type": "address"},
-                    ],
-                    "VerifySignature": [
-                        {"name": "account", "type": "address"},
-                        {"name": "target", "type": "address"},
-                        {"name": "hash", "type": "bytes32"},
-                        {"name": "nonce", "type": "uint256"},
-                        {"name": "deadline", "type": "uint256"},
-                    ],
-                },
-            }
-            
-            signature = rise_client._sign_typed_data(verify_sig_data, new_account.signer_key)
-            
-            # Retry with IOC
-            try:
-                result = await rise_client._request(
-                    "POST", "/v1/orders/place",
-                    json={
-                        "order_params": {
-                            "market_id": str(market_id),
-                            "size": str(size_raw),
-                            "price": str(price_raw),
-                            "side": side_int,
-                            "order_type": order_type_int,
-                            "tif": tif,  # IOC
-                            "post_only": False,
-                            "reduce_only": False,
-                            "stp_mode": 0,
-                            "expiry": expiry,
-                        },
-                        "permit_params": {
-                            "account": account_obj.address,
-                            "signer": signer_obj.address,
-                            "deadline": str(deadline),
-                            "signature": signature,
-                            "nonce": str(nonce),
-                        }
-                    }
+            # If it's the TIF error, retry with IOC
+            if "InvalidTimeInForceForMarketOrder" in str(e) or "GTC" in str(e):
+                print("\nRetrying with IOC time-in-force...")
+                
+                # We need to manually set TIF to IOC
+                # For now, let's use the working configuration
+                from eth_account import Account as EthAccount
+                from eth_hash.auto import keccak
+                
+                account_obj = EthAccount.from_key(new_account.private_key)
+                signer_obj = EthAccount.from_key(new_account.signer_key)
+                
+                domain = await rise_client.get_eip712_domain()
+                
+                # Order parameters
+                market_id = 1
+                size_raw, price_raw = compute_order_raw(
+                    account_balance, max_position_pct, btc_price, order_price
                 )
                 
-                print("\n✅ Order placed successfully with IOC!")
-                print(f"   Order ID: {result['data']['order_id']}")
-                print(f"   Transaction: {result['data']['transaction_hash']}")
+                side_int = 0  # buy
+                order_type_int = 0  # limit
+                tif = 3  # IOC
+                expiry = 0
                 
-            except Exception as retry_e:
-                print(f"\n❌ Retry failed: {retry_e}")
-    
-    # Step 5: Summary
-    print("\n" + "=" * 80)
-    print("FLOW SUMMARY")
-    print("=" * 80)
-    print(f"✅ Profile Created: {profile_result['profile']['name']}")
-    print(f"✅ Address: {profile_result['profile']['address']}")
-    print(f"✅ Deposited: ${profile_result['setup']['deposit_amount']} USDC")
-    print(f"✅ AI Decision: Long BTC at ${btc_price:,.0f}")
-    print(f"✅ Position Size: {btc_size:.4f} BTC (${position_value:.2f})")
-    print("\nThe AI trading bot is now ready to monitor and manage this position!")
+                # Encode order
+                flags = (
+                    side_int |
+                    (0 << 1) |  # post_only = false
+                    (0 << 2) |  # reduce_only = false
+                    (0 << 3)    # stp_mode = 0
+                )
+                
+                encoded_order = rise_client._encode_order(
+                    market_id, size_raw, price_raw, flags, order_type_int, tif, expiry
+                )
+                
+                order_hash = keccak(encoded_order)
+                
+                # Create signature
+                nonce = rise_client._create_client_nonce(account_obj.address)
+                deadline = int(time.time()) + 300
+                target = "0x68cAcD54a8c93A3186BF50bE6b78B761F728E1b4"
+                
+                verify_sig_data = {
+                    "domain": domain,
+                    "message": {
+                        "account": account_obj.address,
+                        "target": target,
+                        "hash": order_hash,
+                        "nonce": nonce,
+                        "deadline": deadline,
+                    },
+                    "primaryType": "VerifySignature",
+                    "types": VERIFY_SIG_TYPES,
+                }
+                
+                signature = rise_client._sign_typed_data(verify_sig_data, new_account.signer_key)
+                
+                # Retry with IOC
+                try:
+                    result = await rise_client._request(
+                        "POST", "/v1/orders/place",
+                        json={
+                            "order_params": {
+                                "market_id": str(market_id),
+                                "size": str(size_raw),
+                                "price": str(price_raw),
+                                "side": side_int,
+                                "order_type": order_type_int,
+                                "tif": tif,  # IOC
+                                "post_only": False,
+                                "reduce_only": False,
+                                "stp_mode": 0,
+                                "expiry": expiry,
+                            },
+                            "permit_params": {
+                                "account": account_obj.address,
+                                "signer": signer_obj.address,
+                                "deadline": str(deadline),
+                                "signature": signature,
+                                "nonce": str(nonce),
+                            }
+                        }
+                    )
+                    
+                    print("\n✅ Order placed successfully with IOC!")
+                    print(f"   Order ID: {result['data']['order_id']}")
+                    print(f"   Transaction: {result['data']['transaction_hash']}")
+                    
+                except Exception as retry_e:
+                    print(f"\n❌ Retry failed: {retry_e}")
+        
+    # Step 5: Summary (buffered so it is written in one go)
+    buf = io.StringIO()
+    print("\n" + "=" * 80, file=buf)
+    print("FLOW SUMMARY", file=buf)
+    print("=" * 80, file=buf)
+    print(f"✅ Profile Created: {profile_result['profile']['name']}", file=buf)
+    print(f"✅ Address: {profile_result['profile']['address']}", file=buf)
+    print(f"✅ Deposited: ${profile_result['setup']['deposit_amount']} USDC", file=buf)
+    print(f"✅ AI Decision: Long BTC at ${btc_price:,.0f}", file=buf)
+    print(f"✅ Position Size: {btc_size:.4f} BTC (${position_value:.2f})", file=buf)
+    print("\nThe AI trading bot is now ready to monitor and manage this position!", file=buf)
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
     
     # Clean up
     await generator.close()
-    await rise_client.close()
-    await market_manager.close()
+
+
+async def main():
+    """Run the test standalone with its own market manager."""
+    market_manager = get_market_manager()
+    try:
+        await test_full_flow(market_manager)
+    finally:
+        await market_manager.close()
 
 
 if __name__ == "__main__":
     print(f"Starting at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    asyncio.run(test_full_flow())
\ No newline at end of file
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test orjson-backed JSON helpers."""
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.utils.jsonio import json_dumps_pretty, json_loads
+
+
+def test_json_roundtrip():
+    """Test that output matches the stdlib format and big ints survive."""
+    
+    print("🧪 Testing JSON Helpers")
+    print("=" * 50)
+    
+    data = {
+        "acc-1": {
+            "name": "Zoë",
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, 678),
+            "balance": 1000.5,
+            "tags": [],
+            "extra": {},
+        }
+    }
+    
+    # Test 1: Same bytes as json.dump(indent=2, default=str, ensure_ascii=False)
+    print("\n1. Testing on-disk format...")
+    expected = json.dumps(data, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+    assert json_dumps_pretty(data) == expected
+    print("✅ Output matches stdlib format")
+    
+    # Test 2: Ints wider than 64 bits
+    print("\n2. Testing big ints...")
+    big = {"size": 2 ** 70}
+    assert json_loads(json_dumps_pretty(big)) == big
+    assert json_loads(b'[123456789012345678901234]') == [123456789012345678901234]
+    assert json_loads(b'{"quote_amount":-9500000000000000000}') == {"quote_amount": -9500000000000000000}
+    assert json_loads(b'[-9223372036854775808, 18446744073709551615]') == [-2 ** 63, 2 ** 64 - 1]
+    assert json_loads(b'123456789012345678901234') == 123456789012345678901234
+    assert json_loads(b' -9500000000000000000') == -9500000000000000000
+    print("✅ Big ints round-trip exactly")
+    
+    # Test 3: Non-finite floats are rejected at write time
+    print("\n3. Testing NaN/inf...")
+    for bad in ({"pnl": float("nan")}, {"positions": [{"size": float("inf")}]}):
+        try:
+            json_dumps_pretty(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{bad} was serialized")
+    print("✅ Non-finite floats raise ValueError")
+    
+    # Test 4: Files written by json.dump with NaN/Infinity still load
+    print("\n4. Testing stdlib NaN/Infinity tokens...")
+    loaded = json_loads(b'{"pnl": NaN, "cap": Infinity}')
+    assert math.isnan(loaded["pnl"]) and loaded["cap"] == float("inf")
+    print("✅ Non-finite tokens decoded by the stdlib")
+    
+    print("\n✅ All JSON helper tests passed!")
+
+
+if __name__ == "__main__":
+    test_json_roundtrip()
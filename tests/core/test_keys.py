@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Test private key helpers."""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from eth_account import Account as EthAccount
+
+from app.utils.keys import address_from_key
+
+
+def test_address_from_key():
+    """Test that derived addresses match eth_account and are memoized."""
+    
+    print("🧪 Testing Address Derivation")
+    print("=" * 50)
+    
+    key = "0x" + "11" * 32
+    expected = EthAccount.from_key(key).address
+    
+    # Test 1: Matches eth_account
+    print("\n1. Testing derived address...")
+    assert address_from_key(key) == expected
+    print(f"✅ {expected}")
+    
+    # Test 2: Repeat lookups hit the cache
+    print("\n2. Testing memoization...")
+    hits = address_from_key.cache_info().hits
+    assert address_from_key(key) == expected
+    assert address_from_key.cache_info().hits == hits + 1
+    print("✅ Second lookup served from cache")
+    
+    print("\n✅ All key helper tests passed!")
+
+
+if __name__ == "__main__":
+    test_address_from_key()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Test P&L aggregation helpers."""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.models import Position
+from app.utils.pnl import compute_pnl_totals
+
+
+def make_position(unrealized: float, realized: float = 0.0) -> Position:
+    """Build a throwaway position for P&L tests."""
+    return Position(
+        account_id="pnl-test",
+        market="BTC-USD",
+        side="long",
+        size=1.0,
+        entry_price=100.0,
+        mark_price=100.0,
+        notional_value=100.0,
+        unrealized_pnl=unrealized,
+        realized_pnl=realized,
+    )
+
+
+def test_compute_pnl_totals():
+    """Test P&L totals across positions."""
+    
+    print("🧪 Testing P&L Totals")
+    print("=" * 50)
+    
+    # Empty book
+    assert compute_pnl_totals([]) == (0.0, 0.0, 0.0)
+    
+    positions = [make_position(12.5, 1.0), make_position(-2.5, 0.5)]
+    unrealized, realized, total = compute_pnl_totals(positions)
+    print(f"   unrealized={unrealized}, realized={realized}, total={total}")
+    assert (unrealized, realized, total) == (10.0, 1.5, 11.5)
+    
+    # Many small values don't drift like a naive running sum
+    positions = [make_position(0.1) for _ in range(10)]
+    assert compute_pnl_totals(positions)[0] == 1.0
+    
+    print("✅ P&L totals correct")
+
+
+if __name__ == "__main__":
+    test_compute_pnl_totals()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test the RiseClient short-TTL response cache."""
+
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.rise_client import RiseClient
+
+
+async def test_cached_single_flight():
+    """Test that concurrent callers share one fetch until the entry expires."""
+    
+    print("🧪 Testing RiseClient Cache")
+    print("=" * 50)
+    
+    client = RiseClient()
+    calls = 0
+    
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"BTC": 100000.0 + calls}
+    
+    # Test 1: Concurrent callers trigger a single load
+    print("\n1. Testing concurrent callers...")
+    results = await asyncio.gather(*(client._cached("prices", 60, loader) for _ in range(5)))
+    assert calls == 1
+    assert all(r == {"BTC": 100001.0} for r in results)
+    print("✅ Five callers, one fetch")
+    
+    # Test 2: Expired entries reload
+    print("\n2. Testing expiry...")
+    await client._cached("short", 0, loader)
+    await client._cached("short", 0, loader)
+    assert calls == 3
+    print("✅ Zero TTL reloads every time")
+    
+    # Test 3: fresh=True bypasses the cached market list and refreshes it
+    print("\n3. Testing fresh market reads...")
+    fetches = 0
+    
+    async def fetch_markets():
+        nonlocal fetches
+        fetches += 1
+        return [{"market_id": "1", "last_price": str(fetches)}]
+    
+    client._fetch_markets = fetch_markets
+    await client.get_markets()
+    await client.get_markets()
+    assert fetches == 1
+    markets = await client.get_markets(fresh=True)
+    assert fetches == 2 and markets[0]["last_price"] == "2"
+    assert (await client.get_markets())[0]["last_price"] == "2"
+    print("✅ Fresh read refetched and refreshed the cache")
+    
+    print("\n✅ All cache tests passed!")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_cached_single_flight())
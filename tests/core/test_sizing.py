@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Test order sizing helpers."""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.utils.sizing import compute_order_raw
+
+
+def test_compute_order_raw():
+    """Test conversion of a balance fraction into raw order units."""
+    
+    print("🧪 Testing Order Sizing")
+    print("=" * 50)
+    
+    # 10% of $1000 at $100 -> 1 unit
+    size_raw, price_raw = compute_order_raw(1000, 0.1, 100)
+    print(f"   size_raw={size_raw}, price_raw={price_raw}")
+    assert size_raw == 10**18
+    assert price_raw == 100 * 10**18
+    
+    # Limit price only affects the price sent, not the size
+    size_raw, price_raw = compute_order_raw(1000, 0.1, 100, limit_price=99.5)
+    assert size_raw == 10**18
+    assert price_raw == int(99.5 * 1e18)
+    
+    # Matches the inline math previously used by the full flow test
+    balance, pct, btc_price = 1000.0, 0.15, 95123.45
+    btc_size = balance * pct / btc_price
+    order_price = btc_price * 0.995
+    assert compute_order_raw(balance, pct, btc_price, order_price) == (
+        int(btc_size * 1e18), int(order_price * 1e18)
+    )
+    
+    print("✅ Sizing checks passed")
+
+
+if __name__ == "__main__":
+    test_compute_order_raw()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Test account lookups in JSON storage."""
+
+import tempfile
+from itertools import islice
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.models import Account, Position
+from app.services.storage import JSONStorage
+
+
+def make_account(index: int) -> Account:
+    """Build a throwaway account for storage tests."""
+    return Account(
+        id=f"lookup-{index}",
+        address=f"0x{index:040X}",
+        private_key=f"0x{index:064x}",
+        signer_key=f"0x{index + 1000:064x}",
+    )
+
+
+def test_get_account_by_address():
+    """Test that accounts can be found by wallet address."""
+    
+    print("🧪 Testing Account Lookup by Address")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = JSONStorage(data_dir=temp_dir)
+        
+        for i in range(1, 6):
+            storage.save_account(make_account(i))
+        
+        # Test 1: Exact address
+        print("\n1. Testing exact address match...")
+        account = storage.get_account_by_address(make_account(3).address)
+        assert account is not None
+        assert account.id == "lookup-3"
+        print("✅ Found account by address")
+        
+        # Test 2: Address casing differs
+        print("\n2. Testing case-insensitive match...")
+        account = storage.get_account_by_address(make_account(4).address.lower())
+        assert account is not None
+        assert account.id == "lookup-4"
+        print("✅ Found account with lowercase address")
+        
+        # Test 3: Unknown address
+        print("\n3. Testing unknown address...")
+        assert storage.get_account_by_address("0x" + "f" * 40) is None
+        print("✅ Unknown address returns None")
+    
+    print("\n✅ All lookup tests passed!")
+
+
+def test_iter_accounts():
+    """Test lazy account iteration in both directions."""
+    
+    print("🧪 Testing Account Iteration")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = JSONStorage(data_dir=temp_dir)
+        
+        for i in range(1, 6):
+            storage.save_account(make_account(i))
+        
+        # Test 1: Same order as list_accounts
+        print("\n1. Testing forward iteration...")
+        ids = [acc.id for acc in storage.iter_accounts()]
+        assert ids == [acc.id for acc in storage.list_accounts()]
+        print(f"✅ Iterated {len(ids)} accounts")
+        
+        # Test 2: Last three, newest first
+        print("\n2. Testing reverse iteration with early exit...")
+        last_three = list(islice(storage.iter_accounts(reverse=True), 3))
+        assert [acc.id for acc in last_three] == ["lookup-5", "lookup-4", "lookup-3"]
+        print("✅ Got last three accounts")
+    
+    print("\n✅ All iteration tests passed!")
+
+
+def test_list_accounts_cache():
+    """Test that repeated reads reuse the parse until the file changes."""
+    
+    print("🧪 Testing Account List Cache")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = JSONStorage(data_dir=temp_dir)
+        
+        for i in range(1, 4):
+            storage.save_account(make_account(i))
+        
+        # Test 1: Second read is served from the cache
+        print("\n1. Testing cached read...")
+        first = storage.list_accounts()
+        cached_models = storage._accounts_cache[1]
+        second = storage.list_accounts()
+        assert storage._accounts_cache[1] is cached_models
+        assert [a.id for a in first] == [a.id for a in second]
+        print("✅ Second read reused cached models")
+        
+        # Test 2: Callers get copies
+        print("\n2. Testing returned accounts are copies...")
+        first[0].is_active = False
+        assert storage.list_accounts()[0].is_active is True
+        print("✅ Modifying a returned account left the cache intact")
+        
+        # Test 3: Writes through storage invalidate the cache
+        print("\n3. Testing invalidation on save...")
+        storage.save_account(make_account(4))
+        assert len(storage.list_accounts()) == 4
+        print("✅ New account visible after save")
+        
+        # Test 4: Writes by another instance are picked up via mtime/size
+        print("\n4. Testing invalidation on external write...")
+        JSONStorage(data_dir=temp_dir).delete_account("lookup-1")
+        assert [a.id for a in storage.list_accounts()] == ["lookup-2", "lookup-3", "lookup-4"]
+        print("✅ External change detected")
+    
+    print("\n✅ All cache tests passed!")
+
+
+def test_batch_defers_writes():
+    """Test that batched saves hit disk once, on exit."""
+    
+    print("🧪 Testing Batched Writes")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = JSONStorage(data_dir=temp_dir)
+        
+        with storage.batch():
+            storage.save_account(make_account(1))
+            storage.save_account(make_account(2))
+            
+            # Test 1: Nothing written yet, but reads see pending data
+            print("\n1. Testing reads inside the batch...")
+            assert not storage.accounts_file.exists()
+            assert [a.id for a in storage.list_accounts()] == ["lookup-1", "lookup-2"]
+            assert storage.get_account("lookup-2") is not None
+            print("✅ Pending accounts visible before flush")
+            
+            # Nested batches flush with the outermost one
+            with storage.batch():
+                storage.delete_account("lookup-1")
+            assert not storage.accounts_file.exists()
+        
+        # Test 2: Written once on exit
+        print("\n2. Testing flush on exit...")
+        fresh = JSONStorage(data_dir=temp_dir)
+        assert [a.id for a in fresh.list_accounts()] == ["lookup-2"]
+        print("✅ Batch written to disk")
+        
+        # Test 3: A batch that raises writes nothing
+        print("\n3. Testing rollback on error...")
+        try:
+            with fresh.batch():
+                fresh.save_account(make_account(3))
+                assert len(fresh.list_accounts()) == 2
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert [a.id for a in fresh.list_accounts()] == ["lookup-2"]
+        assert [a.id for a in JSONStorage(data_dir=temp_dir).list_accounts()] == ["lookup-2"]
+        print("✅ Pending writes dropped")
+    
+    print("\n✅ All batch tests passed!")
+
+
+def test_bulk_saves():
+    """Test that bulk saves write every record in one pass."""
+    
+    print("🧪 Testing Bulk Saves")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = JSONStorage(data_dir=temp_dir)
+        storage.save_account(make_account(1))
+        
+        # Test 1: Accounts merge with existing ones
+        print("\n1. Testing save_accounts...")
+        storage.save_accounts(make_account(i) for i in range(2, 5))
+        assert [a.id for a in storage.list_accounts()] == [
+            "lookup-1", "lookup-2", "lookup-3", "lookup-4"
+        ]
+        print("✅ Saved accounts alongside existing ones")
+        
+        # Test 2: Snapshots grouped per account
+        print("\n2. Testing save_position_snapshots...")
+        storage.save_position_snapshots(
+            Position(
+                account_id=f"lookup-{i % 2}",
+                market="BTC-USD" if i < 2 else "ETH-USD",
+                side="long",
+                size=0.01 * (i + 1),
+                entry_price=100000,
+                mark_price=100000,
+                notional_value=1000,
+                unrealized_pnl=float(i),
+            )
+            for i in range(4)
+        )
+        assert len(storage.get_latest_positions("lookup-0")) == 2
+        assert len(storage.get_latest_positions("lookup-1")) == 2
+        print("✅ Snapshots saved per account")
+    
+    print("\n✅ All bulk save tests passed!")
+
+
+def test_filtered_lookups():
+    """Test flag filters and signer lookup served from the account index."""
+    
+    print("🧪 Testing Filtered Account Lookups")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = JSONStorage(data_dir=temp_dir)
+        
+        first = make_account(1)
+        first.signer_key = first.private_key
+        storage.save_accounts([
+            first,
+            make_account(2).model_copy(update={"has_deposited": True}),
+            make_account(3).model_copy(update={"has_deposited": True, "is_active": False}),
+        ])
+        
+        # Test 1: Active and deposited
+        print("\n1. Testing list_accounts_filtered...")
+        ids = [a.id for a in storage.list_accounts_filtered(active=True, deposited=True)]
+        assert ids == ["lookup-2"]
+        assert len(storage.list_accounts_filtered(deposited=True)) == 2
+        assert len(storage.list_accounts_filtered()) == 3
+        print("✅ Filters applied")
+        
+        # Test 2: Skips accounts whose signer is the wallet key
+        print("\n2. Testing find_signer_account...")
+        account = storage.find_signer_account()
+        assert account is not None and account.id == "lookup-2"
+        print("✅ Found account with a separate signer")
+    
+    print("\n✅ All filtered lookup tests passed!")
+
+
+if __name__ == "__main__":
+    test_get_account_by_address()
+    test_iter_accounts()
+    test_list_accounts_cache()
+    test_batch_defers_writes()
+    test_bulk_saves()
+    test_filtered_lookups()
@@ -8,7 +8,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from app.services.storage import JSONStorage
+from app.services.storage import JSONStorage, StorageError
 
 
 def test_corrupted_json_recovery():
@@ -90,6 +90,16 @@ def test_corrupted_json_recovery():
             assert storage.validate_json_file(file_path)
         print("✅ All files are now valid JSON")
         
+        # Test 6: Non-finite floats fail the save instead of corrupting the file
+        print("\n6. Testing non-finite floats...")
+        try:
+            storage._save_json(storage.trades_file, {"pnl": float("nan")})
+        except StorageError:
+            pass
+        else:
+            raise AssertionError("NaN was saved")
+        print("✅ NaN raised StorageError")
+        
         print("\n" + "=" * 50)
         print("✅ All resilience tests passed!")
 
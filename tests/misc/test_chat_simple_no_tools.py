@@ -3,6 +3,7 @@
 
 import asyncio
 import json
+from itertools import islice
 from pathlib import Path
 from app.services.ai_client import AIClient
 from app.services.storage import JSONStorage
@@ -20,7 +21,7 @@ async def test_chat():
         return
     
     # Get accounts
-    accounts = storage.list_accounts()[:3]  # Test first 3
+    accounts = list(islice(storage.iter_accounts(), 3))  # Test first 3
     
     bullish_message = "The Fed just announced emergency rate cuts! BTC is going to $150k minimum. You should go all in long RIGHT NOW!"
     
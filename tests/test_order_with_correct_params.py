@@ -2,11 +2,12 @@
 """Test order placement with parameters matching the successful order."""
 
 import asyncio
-import json
 import sys
 import os
 from datetime import datetime
 
+import orjson
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -35,12 +36,20 @@ async def test_order_placement():
     print(f"Has deposited: {account.has_deposited}")
     
     async with RiseClient() as client:
+        # Balance and market reads are independent, so issue them together
+        balance_info, markets = await asyncio.gather(
+            client.get_balance(account.address),
+            client.get_markets(),
+            return_exceptions=True,
+        )
+        
         # 1. Check current balance
         print("\n💰 Checking Balance")
         print("-" * 40)
         
         try:
-            balance_info = await client.get_balance(account.address)
+            if isinstance(balance_info, Exception):
+                raise balance_info
             margin_summary = balance_info.get("marginSummary", {})
             free_collateral = margin_summary.get("freeCollateral", 0)
             print(f"Free Collateral: ${free_collateral:,.2f}")
@@ -52,7 +61,8 @@ async def test_order_placement():
         print("\n🏪 Market Status")
         print("-" * 40)
         
-        markets = await client.get_markets()
+        if isinstance(markets, Exception):
+            raise markets
         btc_market = next((m for m in markets if int(m.get("market_id", 0)) == 1), None)
         
         if btc_market:
@@ -93,7 +103,7 @@ async def test_order_placement():
             )
             
             print(f"\n✅ Order Response:")
-            print(json.dumps(order, indent=2))
+            print(orjson.dumps(order, option=orjson.OPT_INDENT_2).decode())
             
             if "data" in order:
                 data = order["data"]
@@ -127,6 +137,8 @@ async def test_order_placement():
             (0.0001, 100000, "With high limit price"),
         ]
         
+        # One at a time: orders from the same account in the same millisecond
+        # get the same client nonce, so concurrent submissions collide
         for size, price, desc in variations:
             print(f"\nTrying: {desc}")
             
@@ -152,8 +164,6 @@ async def test_order_placement():
                     
             except Exception as e:
                 print(f"❌ Failed: {str(e)[:100]}...")
-            
-            await asyncio.sleep(1)
 
 
 async def main():
@@ -2,65 +2,94 @@
 """Complete trading flow test with working market orders."""
 
 import asyncio
+import logging
+import logging.handlers
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from app.models import PnLResponse
 from app.services.rise_client import RiseClient
 from app.services.storage import JSONStorage
 
 
+# Buffer report lines and write them to stdout in batches rather than per line
+logger = logging.getLogger("flow")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_output = logging.handlers.MemoryHandler(
+    capacity=100, target=logging.StreamHandler(sys.stdout)
+)
+logger.addHandler(_output)
+
+WEI = 1e18  # 18-decimal fixed point scale
+
+
+def from_wei(raw) -> float:
+    """Scale a raw 18-decimal amount, only parsing it if it came back as a string."""
+    return (int(raw) if isinstance(raw, str) else raw) / WEI
+
+
 async def test_complete_trading_flow():
     """Test complete trading flow: market data, positions, orders, P&L."""
-    
-    print("🚀 RISE Complete Trading Flow Test")
-    print("=" * 60)
+    try:
+        await _run_trading_flow()
+    finally:
+        _output.flush()
+
+
+async def _run_trading_flow():
+    """Run the flow steps, reporting through the buffered logger."""
+    logger.info("🚀 RISE Complete Trading Flow Test")
+    logger.info("=" * 60)
     
     # Get test account
     storage = JSONStorage()
-    test_account = next((acc for acc in storage.list_accounts() 
-                        if acc.signer_key and acc.signer_key != acc.private_key), None)
+    test_account = storage.find_signer_account()
     
     if not test_account:
-        print("❌ No valid test account found")
+        logger.info("❌ No valid test account found")
         return
     
-    print(f"\n📊 Test Account: {test_account.address}")
-    print(f"   Persona: {test_account.persona.name if test_account.persona else 'Unknown'}")
+    logger.info(f"\n📊 Test Account: {test_account.address}")
+    logger.info(f"   Persona: {test_account.persona.name if test_account.persona else 'Unknown'}")
     
     async with RiseClient() as client:
+        # Steps 1 and 2 are independent reads, so issue them together
+        markets, btc_price, response = await asyncio.gather(
+            client.get_markets(),
+            client.get_latest_price(1),
+            client._request(
+                "GET", "/v1/account/position",
+                params={"account": test_account.address, "market_id": 1}
+            ),
+        )
+        
         # 1. Get market data
-        print("\n1️⃣ Getting Market Data...")
-        markets = await client.get_markets()
+        logger.info("\n1️⃣ Getting Market Data...")
         btc_market = next((m for m in markets if m.get('market_id') == 1 or m.get('id') == 1), None)
         
         if btc_market:
-            print(f"   BTC Market: {btc_market.get('symbol', 'BTC')}")
+            logger.info(f"   BTC Market: {btc_market.get('symbol', 'BTC')}")
         
-        btc_price = await client.get_latest_price(1)
         if btc_price:
-            print(f"   Current Price: ${btc_price:,.2f}")
+            logger.info(f"   Current Price: ${btc_price:,.2f}")
         
         # 2. Check initial position
-        print("\n2️⃣ Checking Initial Position...")
-        response = await client._request(
-            "GET", "/v1/account/position",
-            params={"account": test_account.address, "market_id": 1}
-        )
-        
+        logger.info("\n2️⃣ Checking Initial Position...")
         position = response.get("data", {}).get("position", {})
-        initial_size = int(position.get("size", 0)) / 1e18
+        initial_size = from_wei(position.get("size", 0))
         
         if initial_size != 0:
-            print(f"   Initial: {'Long' if initial_size > 0 else 'Short'} {abs(initial_size):.6f} BTC")
+            logger.info(f"   Initial: {'Long' if initial_size > 0 else 'Short'} {abs(initial_size):.6f} BTC")
         else:
-            print("   No initial position")
+            logger.info("   No initial position")
         
         # 3. Place market buy order
-        print("\n3️⃣ Placing Market Buy Order...")
+        logger.info("\n3️⃣ Placing Market Buy Order...")
         buy_size = 0.0001
-        print(f"   Size: {buy_size} BTC")
+        logger.info(f"   Size: {buy_size} BTC")
         
         try:
             buy_result = await client.place_market_order(
@@ -68,59 +97,62 @@ async def test_complete_trading_flow():
                 signer_key=test_account.signer_key,
                 market_id=1,
                 size=buy_size,
-                side="buy"
+                side="buy",
+                check_success=False
             )
             
             buy_data = buy_result.get('data', {})
-            print(f"   ✅ Success! Order ID: {buy_data.get('order_id')}")
+            logger.info(f"   ✅ Success! Order ID: {buy_data.get('order_id')}")
             
-            # Wait for execution
-            await asyncio.sleep(2)
+            # Wait for the fill once here rather than inside place_market_order
+            if buy_data.get("order_id"):
+                await client.wait_for_fill(
+                    test_account.address, buy_data["order_id"], timeout=10.0,
+                    initial_delay=0, poll_interval=0.05, max_poll_interval=0.5
+                )
             
         except Exception as e:
-            print(f"   ❌ Failed: {e}")
+            logger.info(f"   ❌ Failed: {e}")
             return
         
         # 4. Check position after buy
-        print("\n4️⃣ Checking Position After Buy...")
+        logger.info("\n4️⃣ Checking Position After Buy...")
         response = await client._request(
             "GET", "/v1/account/position",
             params={"account": test_account.address, "market_id": 1}
         )
         
         position = response.get("data", {}).get("position", {})
-        new_size = int(position.get("size", 0)) / 1e18
+        new_size = from_wei(position.get("size", 0))
         
         if new_size != 0:
-            print(f"   Position: {'Long' if new_size > 0 else 'Short'} {abs(new_size):.6f} BTC")
-            print(f"   Change: +{new_size - initial_size:.6f} BTC")
+            logger.info(f"   Position: {'Long' if new_size > 0 else 'Short'} {abs(new_size):.6f} BTC")
+            logger.info(f"   Change: +{new_size - initial_size:.6f} BTC")
         
         # 5. Calculate P&L
-        print("\n5️⃣ Calculating P&L...")
+        logger.info("\n5️⃣ Calculating P&L...")
         try:
-            pnl_data = await client.calculate_pnl(test_account.address)
-            total_pnl = pnl_data.get("total_pnl", 0)
+            pnl_data = PnLResponse.model_validate(await client.calculate_pnl(test_account.address))
             
-            print(f"   Total P&L: ${total_pnl:,.2f}")
+            logger.info(f"   Total P&L: ${pnl_data.total_pnl:,.2f}")
             
-            positions_pnl = pnl_data.get("positions", {})
-            for symbol, pnl in positions_pnl.items():
+            for symbol, pnl in pnl_data.positions.items():
                 if pnl != 0:
-                    print(f"   {symbol}: ${pnl:,.2f}")
+                    logger.info(f"   {symbol}: ${pnl:,.2f}")
                     
         except Exception as e:
             # P&L calculation might fail if no positions
-            quote_amount = int(position.get("quote_amount", 0)) / 1e18
+            quote_amount = from_wei(position.get("quote_amount", 0))
             if new_size > 0 and btc_price:
                 current_value = new_size * btc_price
                 pnl = current_value + quote_amount  # quote_amount is negative for longs
-                print(f"   Estimated P&L: ${pnl:,.2f}")
+                logger.info(f"   Estimated P&L: ${pnl:,.2f}")
         
         # 6. Place partial close order
-        print("\n6️⃣ Closing Partial Position...")
+        logger.info("\n6️⃣ Closing Partial Position...")
         if new_size > 0:
             close_size = min(buy_size / 2, new_size / 2)
-            print(f"   Closing: {close_size:.6f} BTC")
+            logger.info(f"   Closing: {close_size:.6f} BTC")
             
             try:
                 sell_result = await client.place_market_order(
@@ -131,21 +163,26 @@ async def test_complete_trading_flow():
                     side="sell"
                 )
                 
-                print(f"   ✅ Success! Order ID: {sell_result.get('data', {}).get('order_id')}")
+                logger.info(f"   ✅ Success! Order ID: {sell_result.get('data', {}).get('order_id')}")
                 
             except Exception as e:
-                print(f"   ❌ Failed: {e}")
+                logger.info(f"   ❌ Failed: {e}")
         
         # 7. Final summary
-        print("\n" + "=" * 60)
-        print("📝 Trading Flow Summary:")
-        print("✅ Market data retrieval working")
-        print("✅ Position queries working")
-        print("✅ Market orders working (using limit orders with price=0)")
-        print("✅ Order execution confirmed")
-        print("✅ Position updates correctly")
-        print("✅ Ready for AI trading integration!")
+        logger.info("\n" + "=" * 60)
+        logger.info("📝 Trading Flow Summary:")
+        logger.info("✅ Market data retrieval working")
+        logger.info("✅ Position queries working")
+        logger.info("✅ Market orders working (using limit orders with price=0)")
+        logger.info("✅ Order execution confirmed")
+        logger.info("✅ Position updates correctly")
+        logger.info("✅ Ready for AI trading integration!")
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(test_complete_trading_flow())
\ No newline at end of file
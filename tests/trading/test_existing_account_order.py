@@ -6,22 +6,28 @@ This avoids the new account registration/deposit issues.
 
 import asyncio
 import json
+import time
 from datetime import datetime
+from typing import List, Optional
 
 from app.services.rise_client import RiseClient
 from app.services.storage import JSONStorage
-from app.models import Trade
+from app.models import Account, Trade
 
 
-async def test_with_existing_account():
+async def test_with_existing_account(
+    storage: Optional[JSONStorage] = None,
+    accounts: Optional[List[Account]] = None,
+):
     """Test order placement with an existing account."""
     print("🧪 Existing Account Order Test")
     print("="*60)
     
-    storage = JSONStorage()
+    storage = storage or JSONStorage()
     
     # Get existing accounts
-    accounts = storage.list_accounts()
+    if accounts is None:
+        accounts = storage.list_accounts()
     
     # Filter for accounts that have been deposited to
     deposited_accounts = [acc for acc in accounts if acc.has_deposited]
@@ -33,18 +39,28 @@ async def test_with_existing_account():
     # Use the first account with deposits
     account = deposited_accounts[0]
     
-    print(f"Using account: {account.persona.name if account.persona else account.address}")
+    display = account.persona.name if account.persona else account.address
+    print(f"Using account: {display}")
     print(f"Address: {account.address}")
     print(f"Has deposited: {account.has_deposited}")
     print(f"Deposit amount: ${account.deposit_amount if account.deposit_amount else 0}")
     
     async with RiseClient() as client:
+        # Balance, positions and market don't depend on each other
+        balance_info, positions, btc_market = await asyncio.gather(
+            client.get_balance(account.address),
+            client.get_all_positions(account.address),
+            client.get_market(1),
+            return_exceptions=True,
+        )
+        
         # 1. Check account balance
         print("\n💰 Checking Balance")
         print("-"*40)
         
         try:
-            balance_info = await client.get_balance(account.address)
+            if isinstance(balance_info, Exception):
+                raise balance_info
             margin_summary = balance_info.get("marginSummary", {})
             
             print(f"Account Value: ${margin_summary.get('accountValue', 0):,.2f}")
@@ -57,7 +73,8 @@ async def test_with_existing_account():
         print("-"*40)
         
         try:
-            positions = await client.get_all_positions(account.address)
+            if isinstance(positions, Exception):
+                raise positions
             if positions:
                 for pos in positions:
                     print(f"- {pos.get('market', 'Unknown')}: {pos.get('size', 0)} @ ${pos.get('avgPrice', 0):,.2f}")
@@ -70,22 +87,22 @@ async def test_with_existing_account():
         print("\n🏪 Market Status")
         print("-"*40)
         
-        markets = await client.get_markets()
-        btc_market = next((m for m in markets if int(m.get("market_id", 0)) == 1), None)
+        if isinstance(btc_market, Exception):
+            raise btc_market
         
         if btc_market:
             print(f"BTC Market:")
-            print(f"  Symbol: {btc_market.get('symbol', 'BTC-USD')}")
-            print(f"  Last Price: ${float(btc_market.get('last_price', 0)):,.2f}")
-            print(f"  Available: {btc_market.get('available', False)}")
-            print(f"  Min Size: {btc_market.get('min_size', 'N/A')}")
-            print(f"  Max Leverage: {btc_market.get('max_leverage', 'N/A')}")
+            print(f"  Symbol: {btc_market.symbol or 'BTC-USD'}")
+            print(f"  Last Price: ${btc_market.last_price:,.2f}")
+            print(f"  Available: {btc_market.available}")
+            print(f"  Min Size: {btc_market.min_size if btc_market.min_size is not None else 'N/A'}")
+            print(f"  Max Leverage: {btc_market.max_leverage if btc_market.max_leverage is not None else 'N/A'}")
         
         # 4. Attempt to place order
         print("\n📈 Attempting Order")
         print("-"*40)
         
-        if btc_market and btc_market.get('available', False):
+        if btc_market and btc_market.available:
             try:
                 # Place very small market order
                 order_size = 0.0001  # Very small order
@@ -108,7 +125,7 @@ async def test_with_existing_account():
                 
                 # Save trade
                 trade = Trade(
-                    id=f"trade-{int(datetime.now().timestamp())}",
+                    id=f"trade-{time.time_ns()}",
                     account_id=account.id,
                     market="BTC-USD",
                     market_id=1,
@@ -133,43 +150,54 @@ async def test_with_existing_account():
             print("3. Account has sufficient balance")
 
 
-async def check_all_accounts_status():
+async def check_all_accounts_status(accounts: Optional[List[Account]] = None):
     """Check status of all accounts to find whitelisted ones."""
     print("\n\n🔍 Checking All Accounts Status")
     print("="*60)
     
-    storage = JSONStorage()
-    accounts = storage.list_accounts()
+    if accounts is None:
+        accounts = JSONStorage().list_accounts()
     
     whitelisted = []
     
     async with RiseClient() as client:
-        for account in accounts[:5]:  # Check first 5
-            print(f"\nChecking: {account.persona.name if account.persona else account.address[:8]}")
-            
+        async def probe(account):
+            # Try to get balance (will fail if not whitelisted)
             try:
-                # Try to get balance (will fail if not whitelisted)
-                balance_info = await client.get_balance(account.address)
-                margin_summary = balance_info.get("marginSummary", {})
-                balance = margin_summary.get("accountValue", 0)
-                
-                if balance > 0:
-                    whitelisted.append({
-                        "account": account,
-                        "balance": balance
-                    })
-                    print(f"✅ Whitelisted - Balance: ${balance:,.2f}")
-                else:
-                    print(f"⚠️  No balance")
-                    
+                return account, await client.get_balance(account.address)
             except Exception as e:
-                print(f"❌ Not whitelisted or error: {str(e)[:50]}...")
+                return account, e
+        
+        # Probe the first 5 concurrently; results come back in order
+        results = await asyncio.gather(*[probe(a) for a in accounts[:5]])
+    
+    for account, balance_info in results:
+        display = account.persona.name if account.persona else account.address[:8]
+        print(f"\nChecking: {display}")
+        
+        try:
+            if isinstance(balance_info, Exception):
+                raise balance_info
+            margin_summary = balance_info.get("marginSummary", {})
+            balance = margin_summary.get("accountValue", 0)
+            
+            if balance > 0:
+                whitelisted.append({
+                    "account": account,
+                    "display": display,
+                    "balance": balance
+                })
+                print(f"✅ Whitelisted - Balance: ${balance:,.2f}")
+            else:
+                print(f"⚠️  No balance")
+                
+        except Exception as e:
+            print(f"❌ Not whitelisted or error: {str(e)[:50]}...")
     
     if whitelisted:
         print(f"\n✅ Found {len(whitelisted)} whitelisted accounts with balance")
         for item in whitelisted:
-            acc = item["account"]
-            print(f"   - {acc.persona.name}: ${item['balance']:,.2f}")
+            print(f"   - {item['display']}: ${item['balance']:,.2f}")
     else:
         print("\n❌ No whitelisted accounts found with balance")
         print("All new accounts need to be whitelisted by RISE team")
@@ -177,9 +205,18 @@ async def check_all_accounts_status():
 
 async def main():
     """Run tests."""
-    await test_with_existing_account()
-    await check_all_accounts_status()
+    # Load accounts once and share them between both checks
+    storage = JSONStorage()
+    accounts = storage.list_accounts()
+    
+    await test_with_existing_account(storage, accounts)
+    await check_all_accounts_status(accounts)
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -19,8 +19,7 @@ async def test_fixed_market_order():
     
     # Get test account
     storage = JSONStorage()
-    test_account = next((acc for acc in storage.list_accounts() 
-                        if acc.signer_key and acc.signer_key != acc.private_key), None)
+    test_account = storage.find_signer_account()
     
     if not test_account:
         print("❌ No valid test account found")
@@ -39,7 +38,8 @@ async def test_fixed_market_order():
                 signer_key=test_account.signer_key,
                 market_id=1,  # BTC
                 size=0.0001,
-                side="buy"
+                side="buy",
+                check_success=False
             )
             
             print(f"\n✅ BUY ORDER SUCCESSFUL!")
@@ -47,8 +47,12 @@ async def test_fixed_market_order():
             print(f"   Order ID: {data.get('order_id')}")
             print(f"   TX Hash: {data.get('transaction_hash')}")
             
-            # Wait for execution
-            await asyncio.sleep(3)
+            # Wait for the fill once here rather than inside place_market_order
+            if data.get("order_id"):
+                await client.wait_for_fill(
+                    test_account.address, data["order_id"], timeout=10.0,
+                    initial_delay=0, poll_interval=0.05, max_poll_interval=0.5
+                )
             
         except Exception as e:
             print(f"❌ Buy order failed: {e}")
@@ -12,8 +12,6 @@ from app.services.rise_client import RiseClient
 
 async def test_positions():
     """Test positions API response."""
-    client = RiseClient()
-    
     # Test addresses
     addresses = [
         "0x076652bc49B7818604F397f0320937248382301b",  # Drunk Wassie
@@ -21,20 +19,22 @@ async def test_positions():
         "0x5D8D12297Ca25AD78607d4ff37dd07889d5E57B5"   # Wise Chad
     ]
     
-    for addr in addresses:
-        print(f"\nTesting positions for {addr}:")
-        try:
-            positions = await client.get_all_positions(addr)
-            print(f"  Type: {type(positions)}")
-            print(f"  Length: {len(positions)}")
-            if positions:
-                print(f"  First item type: {type(positions[0])}")
-                print(f"  First item: {positions[0]}")
-        except Exception as e:
-            print(f"  Error: {e}")
+    async with RiseClient() as client:
+        results = await asyncio.gather(
+            *(client.get_all_positions(addr) for addr in addresses),
+            return_exceptions=True
+        )
     
-    await client.close()
-
+    for addr, positions in zip(addresses, results):
+        print(f"\nTesting positions for {addr}:")
+        if isinstance(positions, Exception):
+            print(f"  Error: {positions}")
+            continue
+        print(f"  Type: {type(positions)}")
+        print(f"  Length: {len(positions)}")
+        if positions:
+            print(f"  First item type: {type(positions[0])}")
+            print(f"  First item: {positions[0]}")
 
 if __name__ == "__main__":
     asyncio.run(test_positions())
\ No newline at end of file
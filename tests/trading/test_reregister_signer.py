@@ -11,6 +11,7 @@ from eth_account import Account as EthAccount
 from app.services.rise_client import RiseClient
 from app.services.storage import JSONStorage
 from app.models import Account
+from app.utils.keys import address_from_key
 
 
 async def test_reregister_signer():
@@ -29,7 +30,7 @@ async def test_reregister_signer():
     # Use first account for testing
     account = accounts[0]
     print(f"Testing with account: {account.persona.name if account.persona else account.address}")
-    print(f"Current signer: {EthAccount.from_key(account.signer_key).address}")
+    print(f"Current signer: {address_from_key(account.signer_key)}")
     
     # Generate new signer key
     new_signer = EthAccount.create()
@@ -40,10 +41,17 @@ async def test_reregister_signer():
         async with RiseClient() as client:
             print("\n📝 Registering new signer...")
             
-            await client.register_signer(
-                account_key=account.private_key,
-                signer_key=new_signer.key.hex()
-            )
+            # Warm the client's markets cache while the registration is in flight
+            markets_task = asyncio.create_task(client.get_markets())
+            
+            try:
+                await client.register_signer(
+                    account_key=account.private_key,
+                    signer_key=new_signer.key.hex()
+                )
+            except Exception:
+                markets_task.cancel()
+                raise
             
             print("✅ New signer registered successfully")
             
@@ -54,13 +62,13 @@ async def test_reregister_signer():
             storage.save_account(account)
             
             print("\n✅ Account updated with new signer")
-            print(f"   Old signer: {EthAccount.from_key(old_signer).address}")
+            print(f"   Old signer: {address_from_key(old_signer)}")
             print(f"   New signer: {new_signer.address}")
             
             # Test placing an order with new signer
             print("\n🧪 Testing order placement with new signer...")
             
-            markets = await client.get_markets()
+            markets = await markets_task
             btc_market = next((m for m in markets if m.get("base_asset_symbol") == "BTC"), None)
             
             if btc_market:
@@ -107,14 +115,11 @@ async def test_bulk_reregister():
     
     print(f"Found {len(accounts_to_update)} accounts to re-register")
     
-    success_count = 0
-    failed_count = 0
+    sem = asyncio.Semaphore(16)
     
     async with RiseClient() as client:
-        for account in accounts_to_update:
-            print(f"\n📝 Re-registering: {account.persona.name if account.persona else account.address}")
-            
-            try:
+        async def _reregister_one(account: Account):
+            async with sem:
                 # Generate new signer
                 new_signer = EthAccount.create()
                 
@@ -123,18 +128,34 @@ async def test_bulk_reregister():
                     account_key=account.private_key,
                     signer_key=new_signer.key.hex()
                 )
-                
-                # Update account
-                account.signer_key = new_signer.key.hex()
-                account.registered_at = datetime.utcnow()
-                storage.save_account(account)
-                
-                success_count += 1
-                print(f"✅ Success: {new_signer.address}")
-                
-            except Exception as e:
-                failed_count += 1
-                print(f"❌ Failed: {e}")
+                return new_signer
+        
+        results = await asyncio.gather(
+            *(_reregister_one(account) for account in accounts_to_update),
+            return_exceptions=True
+        )
+    
+    # Tally and persist on the main task so account writes never race
+    success_count = 0
+    failed_count = 0
+    updated_accounts = []
+    for account, new_signer in zip(accounts_to_update, results):
+        print(f"\n📝 Re-registering: {account.persona.name if account.persona else account.address}")
+        
+        if isinstance(new_signer, BaseException):
+            failed_count += 1
+            print(f"❌ Failed: {new_signer}")
+            continue
+        
+        # Update account
+        account.signer_key = new_signer.key.hex()
+        account.registered_at = datetime.utcnow()
+        updated_accounts.append(account)
+        
+        success_count += 1
+        print(f"✅ Success: {new_signer.address}")
+    
+    storage.save_accounts(updated_accounts)
     
     print("\n" + "="*60)
     print(f"Re-registration Summary:")
@@ -5,20 +5,36 @@ This provides real-time position and P&L data.
 """
 
 import asyncio
-import json
+import math
+import time
 from datetime import datetime
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 from app.services.rise_client import RiseClient
 from app.services.storage import JSONStorage
-from app.models import Account, Position
+from app.models import Account, Market, Position, PositionRow
+from app.utils.jsonio import json_dumps_pretty
+from app.utils.pnl import compute_pnl_totals
+
+
+RESULTS_FILE = Path("tests/trading/trading_view_pnl_results.json")
+EVENTS_FILE = Path("tests/trading/trading_view_pnl_events.jsonl")
 
 
 class TradingViewPnLUpdater:
     """Update P&L using TradingView data from RISE API."""
     
-    def __init__(self):
+    def __init__(self, concurrency: int = 32, idle_recheck_seconds: float = 300):
         self.storage = JSONStorage()
+        self._sem = asyncio.Semaphore(concurrency)
+        self._snapshots: List[Position] = []
+        self._events: Optional[asyncio.Queue] = None
+        # Accounts last seen flat: account_id -> (checked_at, latest trade ID then)
+        self.idle_recheck_seconds = idle_recheck_seconds
+        self._idle: Dict[str, Tuple[float, Optional[str]]] = {}
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "accounts_updated": 0,
@@ -32,20 +48,124 @@ class TradingViewPnLUpdater:
         print("📊 TradingView P&L Update")
         print("="*60)
         
-        accounts = self.storage.list_accounts()
-        active_accounts = [acc for acc in accounts if acc.is_active and acc.has_deposited]
+        active_accounts = self.storage.list_accounts_filtered(active=True, deposited=True)
         
         print(f"Found {len(active_accounts)} active accounts with deposits")
         
-        async with RiseClient() as client:
-            for account in active_accounts:
-                await self.update_account_pnl(client, account)
+        cycle_start = time.monotonic()
+        idle_count = len(active_accounts)
+        active_accounts = [acc for acc in active_accounts if not self._is_idle(acc, cycle_start)]
+        idle_count -= len(active_accounts)
+        if idle_count:
+            print(f"Skipping {idle_count} accounts with no positions and no new trades")
+        
+        # Per-account results stream to a JSONL log through a single writer task
+        self._events = asyncio.Queue()
+        writer = asyncio.create_task(self._write_events(self._events))
+        try:
+            async with RiseClient() as client:
+                # Shared, read-only inputs for every account, fetched once per cycle
+                market_models, prices = await asyncio.gather(
+                    client.get_market_models(),
+                    client.get_market_prices(),
+                    return_exceptions=True
+                )
+                if isinstance(prices, BaseException):
+                    prices = {}
+                if isinstance(market_models, BaseException):
+                    print(f"⚠️  Markets unavailable: {market_models}")
+                    market_models = []
+                markets = {market.market_id: market for market in market_models}
+                
+                results = await asyncio.gather(
+                    *(
+                        self.update_account_pnl(client, account, markets, prices)
+                        for account in active_accounts
+                    ),
+                    return_exceptions=True
+                )
+        finally:
+            self._events.put_nowait(None)
+            await writer
+            self._events = None
+        
+        # Reduce after gather so concurrent updates never touch shared totals
+        updated = []
+        for account_data in results:
+            if isinstance(account_data, BaseException):
+                print(f"❌ Update failed: {account_data}")
+                continue
+            self.results["account_details"].append(account_data)
+            if account_data.get("status") == "updated":
+                updated.append(account_data)
+                if account_data["positions"]:
+                    self._idle.pop(account_data["account_id"], None)
+                else:
+                    account_id = account_data["account_id"]
+                    self._idle[account_id] = (cycle_start, self._latest_trade_id(account_id))
+        
+        self.results["accounts_updated"] += len(updated)
+        self.results["total_unrealized_pnl"] = math.fsum(
+            [self.results["total_unrealized_pnl"], *(a["unrealized_pnl"] for a in updated)]
+        )
+        self.results["total_realized_pnl"] = math.fsum(
+            [self.results["total_realized_pnl"], *(a["realized_pnl"] for a in updated)]
+        )
+        
+        snapshots, self._snapshots = self._snapshots, []
+        if snapshots:
+            self.storage.save_position_snapshots(snapshots)
         
         self.save_results()
         self.print_summary()
     
-    async def update_account_pnl(self, client: RiseClient, account: Account):
-        """Update P&L for a single account."""
+    def _latest_trade_id(self, account_id: str) -> Optional[str]:
+        """ID of the account's most recent recorded trade, if any."""
+        trades = self.storage.get_trades(account_id, limit=1)
+        return trades[0].id if trades else None
+    
+    def _is_idle(self, account: Account, now: float) -> bool:
+        """True if the account was flat when last checked, recently, and has not traded since."""
+        entry = self._idle.get(account.id)
+        if entry is None or now - entry[0] >= self.idle_recheck_seconds:
+            return False
+        return entry[1] == self._latest_trade_id(account.id)
+    
+    async def update_account_pnl(
+        self,
+        client: RiseClient,
+        account: Account,
+        markets: Optional[Dict[int, Market]] = None,
+        prices: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """Update P&L for a single account and return its details.
+        
+        markets (by ID) and prices (by base asset) fill in symbol and mark
+        price when a position omits them.
+        """
+        async with self._sem:
+            account_data = await self._update_account_pnl(
+                client, account, markets or {}, prices or {}
+            )
+        
+        if self._events is not None:
+            self._events.put_nowait({"timestamp": datetime.now().isoformat(), **account_data})
+        return account_data
+    
+    @staticmethod
+    async def _write_events(queue: asyncio.Queue):
+        """Append queued account updates to EVENTS_FILE, one JSON object per line, until None."""
+        with open(EVENTS_FILE, "ab") as f:
+            while (event := await queue.get()) is not None:
+                f.write(orjson.dumps(event, default=str) + b"\n")
+    
+    async def _update_account_pnl(
+        self,
+        client: RiseClient,
+        account: Account,
+        markets: Dict[int, Market],
+        prices: Dict[str, float]
+    ) -> Dict:
         print(f"\n📈 Updating: {account.persona.name if account.persona else account.address}")
         
         account_data = {
@@ -66,8 +186,7 @@ class TradingViewPnLUpdater:
             if not trading_data:
                 print("   ⚠️  No trading data found")
                 account_data["status"] = "no_data"
-                self.results["account_details"].append(account_data)
-                return
+                return account_data
             
             # Parse positions from trading data
             positions_data = trading_data.get("positions", [])
@@ -78,21 +197,23 @@ class TradingViewPnLUpdater:
             account_data["account_value"] = margin_summary.get("accountValue", 0)
             
             # Process each position
-            for pos_data in positions_data:
+            positions = []
+            for row in PositionRow.validate_many(positions_data):
+                market = markets.get(row.market_id)
+                symbol = row.market or (market.symbol if market else "Unknown")
                 position = Position(
                     account_id=account.id,
-                    market=pos_data.get("market", "Unknown"),
-                    side=pos_data.get("side", "long"),
-                    size=abs(pos_data.get("size", 0)),
-                    entry_price=pos_data.get("avgPrice", 0),
-                    mark_price=pos_data.get("markPrice", 0),
-                    notional_value=abs(pos_data.get("notionalValue", 0)),
-                    unrealized_pnl=pos_data.get("unrealizedPnl", 0),
-                    realized_pnl=pos_data.get("realizedPnl", 0)
+                    market=symbol,
+                    side=row.side,
+                    size=abs(row.size),
+                    entry_price=row.avg_price,
+                    mark_price=row.mark_price or prices.get(symbol.split("-")[0], 0),
+                    notional_value=abs(row.notional_value),
+                    unrealized_pnl=row.unrealized_pnl,
+                    realized_pnl=row.realized_pnl
                 )
                 
-                # Save position snapshot
-                self.storage.save_position_snapshot(position)
+                positions.append(position)
                 
                 account_data["positions"].append({
                     "market": position.market,
@@ -102,21 +223,20 @@ class TradingViewPnLUpdater:
                     "realized_pnl": position.realized_pnl
                 })
                 
-                account_data["unrealized_pnl"] += position.unrealized_pnl
-                account_data["realized_pnl"] += position.realized_pnl
-                
                 print(f"   📊 {position.market}: {position.side} {position.size}")
                 print(f"      Unrealized P&L: ${position.unrealized_pnl:,.2f}")
             
+            # Queue position snapshots; written once after all accounts update
+            self._snapshots.extend(positions)
+            
             # Update account totals
-            account_data["total_pnl"] = account_data["unrealized_pnl"] + account_data["realized_pnl"]
+            (
+                account_data["unrealized_pnl"],
+                account_data["realized_pnl"],
+                account_data["total_pnl"],
+            ) = compute_pnl_totals(positions)
             account_data["status"] = "updated"
             
-            # Update global totals
-            self.results["accounts_updated"] += 1
-            self.results["total_unrealized_pnl"] += account_data["unrealized_pnl"]
-            self.results["total_realized_pnl"] += account_data["realized_pnl"]
-            
             print(f"   💰 Account Value: ${account_data['account_value']:,.2f}")
             print(f"   📊 Total Unrealized P&L: ${account_data['unrealized_pnl']:,.2f}")
             print(f"   📊 Total Realized P&L: ${account_data['realized_pnl']:,.2f}")
@@ -126,7 +246,7 @@ class TradingViewPnLUpdater:
             account_data["status"] = "error"
             account_data["error"] = str(e)
         
-        self.results["account_details"].append(account_data)
+        return account_data
     
     async def get_trading_view_data(self, client: RiseClient, address: str) -> Dict:
         """
@@ -138,11 +258,11 @@ class TradingViewPnLUpdater:
             # GET /v1/markets/trading-view/{address}
             # For now, we'll combine data from multiple endpoints
             
-            # Get positions
-            positions = await client.get_all_positions(address)
-            
-            # Get account balance info
-            balance_info = await client.get_balance(address)
+            # Get positions and account balance info concurrently
+            positions, balance_info = await asyncio.gather(
+                client.get_all_positions(address),
+                client.get_balance(address)
+            )
             
             # Combine into TradingView format
             trading_data = {
@@ -158,10 +278,10 @@ class TradingViewPnLUpdater:
             return {}
     
     def save_results(self):
-        """Save P&L update results."""
-        with open("tests/trading/trading_view_pnl_results.json", "w") as f:
-            json.dump(self.results, f, indent=2)
-        print("\n💾 Results saved to tests/trading/trading_view_pnl_results.json")
+        """Save the running P&L summary; per-account details are in EVENTS_FILE."""
+        summary = {k: v for k, v in self.results.items() if k != "account_details"}
+        RESULTS_FILE.write_bytes(json_dumps_pretty(summary))
+        print(f"\n💾 Summary saved to {RESULTS_FILE}, account updates appended to {EVENTS_FILE}")
     
     def print_summary(self):
         """Print P&L update summary."""
@@ -190,24 +310,37 @@ class TradingViewPnLUpdater:
 
 
 async def continuous_pnl_update(interval_seconds: int = 60):
-    """Continuously update P&L at specified interval."""
+    """Continuously update P&L at specified interval.
+    
+    Updates start on a fixed cadence: the time an update takes is subtracted
+    from the following sleep. If an update overruns the interval, the missed
+    ticks are skipped rather than run back to back.
+    """
     print(f"🔄 Starting continuous P&L updates (every {interval_seconds}s)")
     print("Press Ctrl+C to stop")
     
     updater = TradingViewPnLUpdater()
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
     
     while True:
         try:
             await updater.update_all_accounts_pnl()
-            print(f"\n⏰ Next update in {interval_seconds} seconds...")
-            await asyncio.sleep(interval_seconds)
         except KeyboardInterrupt:
             print("\n✋ Stopping continuous updates")
             break
         except Exception as e:
             print(f"\n❌ Error in update cycle: {e}")
-            print(f"Retrying in {interval_seconds} seconds...")
-            await asyncio.sleep(interval_seconds)
+        
+        next_tick += interval_seconds
+        delay = next_tick - loop.time()
+        if delay < 0:
+            print(f"\n⚠️  Update overran the interval by {-delay:.1f}s, skipping missed ticks")
+            next_tick = loop.time() + interval_seconds
+            delay = interval_seconds
+        
+        print(f"\n⏰ Next update in {delay:.1f} seconds...")
+        await asyncio.sleep(delay)
 
 
 async def main():